@@ -10,10 +10,20 @@ import plotly.graph_objects as go
 from scipy.stats.mstats import winsorize
 import numpy as np
 from pathlib import Path
-import hashlib
-import json
-import os
 from datetime import datetime
+import time
+
+from src.artifacts import find_columnar
+from src.cleaning import GHOST_THRESHOLD, clean_master_data, load_processed_data, source_fingerprint
+from src.aggregates import TREEMAP_NODE_BUDGET, kpi_summary, migration_histogram, state_digital_summary, treemap_nodes
+from src.cube import StateCube
+from src.downsample import SCATTER_POINT_LIMIT, density_grid, scatter_sample
+from src.export import PAGE_SIZES, export_csv, page_count, page_slice
+from src.filter_index import FilterIndex
+from src.search_index import SEARCH_MODES, SearchIndex
+from src.passwords import PasswordHasher
+from src.session_tokens import open_session_tokens
+from src.user_store import USER_ROLES, open_user_store
 
 
 st.set_page_config(
@@ -215,63 +225,127 @@ if 'username' not in st.session_state:
     st.session_state.username = None
 if 'user_role' not in st.session_state:
     st.session_state.user_role = None
+if 'session_token' not in st.session_state:
+    st.session_state.session_token = None
+if 'session_cookie_written' not in st.session_state:
+    st.session_state.session_cookie_written = False
 
-# User database file
-USER_DB_FILE = "user_database.json"
+# User database: SQLite (user_database.db) by default, importing the legacy
+# user_database.json once; set UIDAI_USER_STORE=json to keep the JSON file
 
-def hash_password(password):
-    """Hash password using SHA-256"""
-    return hashlib.sha256(password.encode()).hexdigest()
+@st.cache_resource
+def get_user_store():
+    """Process-wide user store, sharing one connection pool across sessions"""
+    return open_user_store()
 
-def load_users():
-    """Load users from JSON file"""
-    if os.path.exists(USER_DB_FILE):
-        with open(USER_DB_FILE, 'r') as f:
-            return json.load(f)
-    return {}
+@st.cache_resource
+def get_password_hasher():
+    """Process-wide password hasher: calibrated KDF on a bounded thread pool"""
+    return PasswordHasher.calibrated()
 
-def save_users(users):
-    """Save users to JSON file"""
-    with open(USER_DB_FILE, 'w') as f:
-        json.dump(users, f, indent=4)
+def hash_password(password):
+    """Hash password with the calibrated KDF (salted scrypt by default)"""
+    return get_password_hasher().hash(password)
 
 def register_user(username, password, email, role="user"):
     """Register a new user"""
-    users = load_users()
-    
-    if username in users:
-        return False, "Username already exists!"
-    
-    users[username] = {
+    record = {
         "password": hash_password(password),
         "email": email,
         "role": role,
         "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     }
     
-    save_users(users)
+    # Single-row insert; the unique username index rejects duplicates
+    if not get_user_store().add(username, record):
+        return False, "Username already exists!"
     return True, "Registration successful! Please login."
 
 def authenticate_user(username, password):
     """Authenticate user credentials"""
-    users = load_users()
+    store = get_user_store()
+    user = store.get(username)
     
-    if username not in users:
+    if user is None:
         return False, "Username not found!"
     
-    if users[username]["password"] == hash_password(password):
-        return True, users[username]["role"]
+    matches, rehash = get_password_hasher().verify(password, user["password"])
+    if matches:
+        # Legacy SHA-256 (or weaker) hashes are upgraded on a successful login
+        if rehash:
+            store.update(username, password=hash_password(password))
+        return True, user["role"]
     
     return False, "Incorrect password!"
 
+# Signed session token kept in a SameSite cookie (never the URL, which ends up
+# in history, Referer headers and proxy logs), so a refresh or a new tab signs
+# back in with one HMAC check instead of a password login
+SESSION_COOKIE = "uidai_session"
+# Older builds carried the token in this query parameter; it is stripped, never honoured
+LEGACY_SESSION_PARAM = "session"
+
+@st.cache_resource
+def get_session_tokens():
+    """Process-wide session token signer and revocation index"""
+    return open_session_tokens()
+
+def write_session_cookie(token=None, max_age=0):
+    """Set (or, with no token, clear) the session cookie in the browser"""
+    secure = "; Secure" if str(st.context.url or "").startswith("https://") else ""
+    st.html(
+        f"<script>document.cookie = '{SESSION_COOKIE}={token or ''}; Path=/; "
+        f"Max-Age={max_age}; SameSite=Strict{secure}';</script>",
+        unsafe_allow_javascript=True,
+    )
+
+def start_session(username, role, token=None):
+    """Mark this browser session as signed in; a new token is written to the cookie on the next page render"""
+    if token is None:
+        token = get_session_tokens().issue(username, role)
+    st.session_state.authenticated = True
+    st.session_state.username = username
+    st.session_state.user_role = role
+    st.session_state.session_token = token
+    st.session_state.session_cookie_written = token == st.context.cookies.get(SESSION_COOKIE)
+
+def sync_session_cookie():
+    """Write the session cookie once per newly issued token"""
+    token = st.session_state.session_token
+    if token and not st.session_state.session_cookie_written:
+        claims = get_session_tokens().verify(token)
+        if claims is not None:
+            write_session_cookie(token, int(claims['exp'] - time.time()))
+        st.session_state.session_cookie_written = True
+
+def restore_session():
+    """Sign in from a valid session cookie (no user store access)"""
+    if LEGACY_SESSION_PARAM in st.query_params:
+        del st.query_params[LEGACY_SESSION_PARAM]
+    token = st.context.cookies.get(SESSION_COOKIE)
+    if not token:
+        return False
+    claims = get_session_tokens().verify(token)
+    if claims is None:
+        return False
+    start_session(claims['sub'], claims['role'], token)
+    return True
+
 def logout():
     """Logout user"""
+    if st.session_state.session_token:
+        get_session_tokens().revoke(st.session_state.session_token)
     st.session_state.authenticated = False
     st.session_state.username = None
     st.session_state.user_role = None
+    st.session_state.session_token = None
 
 def show_login_page():
     """Display login and registration page"""
+    # Expired, revoked or logged-out session cookie: drop it from the browser
+    if SESSION_COOKIE in st.context.cookies:
+        write_session_cookie()
+
     st.markdown("""
         <div style='text-align: center; margin-bottom: 30px;'>
             <div class='main-header'>
@@ -299,9 +373,7 @@ def show_login_page():
                     if username and password:
                         success, result = authenticate_user(username, password)
                         if success:
-                            st.session_state.authenticated = True
-                            st.session_state.username = username
-                            st.session_state.user_role = result
+                            start_session(username, result)
                             st.success(f"✅ Welcome back, {username}!")
                             st.rerun()
                         else:
@@ -320,7 +392,7 @@ def show_login_page():
                 new_email = st.text_input("Email", placeholder="Enter your email")
                 new_password = st.text_input("Password", type="password", placeholder="Create a password")
                 confirm_password = st.text_input("Confirm Password", type="password", placeholder="Confirm your password")
-                role = st.selectbox("Role", ["user", "admin", "analyst"])
+                role = st.selectbox("Role", USER_ROLES)
                 register = st.form_submit_button("📝 Register")
                 
                 if register:
@@ -340,19 +412,25 @@ def show_login_page():
     
     # Info section
     st.markdown("---")
-    st.info("🔒 **Secure Access**: All passwords are encrypted using SHA-256 hashing. Your credentials are stored securely.")
+    st.info("🔒 **Secure Access**: All passwords are stored as salted, key-stretched hashes (scrypt or PBKDF2). Your credentials are stored securely.")
 
 # ============================================================================
 # DATA LOADING & CLEANING
 # ============================================================================
-@st.cache_data
-def load_and_clean_data():
-    """Load and clean the UIDAI dataset with comprehensive preprocessing"""
-    
-    # Try to load from artifacts folder
-    data_path = Path("artifacts/final_master_data.csv")
-    
-    if not data_path.exists():
+DATA_PATH = Path("artifacts/final_master_data.csv")
+
+@st.cache_data(max_entries=2)
+def load_and_clean_data(data_fingerprint=None):
+    """Load and clean the UIDAI dataset with comprehensive preprocessing
+    
+    `data_fingerprint` (see `source_fingerprint`) is only the cache key: it
+    changes when the dataset file is replaced, so a fresh data drop is
+    picked up without restarting the app. The cleaned result itself comes
+    from the disk cache shared by all workers.
+    """
+    data_path = DATA_PATH
+    
+    if not data_path.exists() and find_columnar(data_path) is None:
         st.error(f"❌ Dataset not found at: {data_path}")
         st.info("📝 Please ensure `artifacts/final_master_data.csv` exists in your project directory.")
         
@@ -367,49 +445,221 @@ def load_and_clean_data():
             'Mobile_Linkage_Rate': np.random.uniform(40, 98, 100),
             'Update_Frequency': np.random.uniform(0, 50, 100)
         })
-        df = sample_data
+        df, report = clean_master_data(sample_data)
     else:
-        df = pd.read_csv(data_path)
-    
-    # 1. Normalize state and district names
-    if 'State' in df.columns:
-        df['State'] = df['State'].astype(str).str.strip().str.upper()
-    if 'District' in df.columns:
-        df['District'] = df['District'].astype(str).str.strip().str.title()
-    
-    # 2. Remove ghost districts (enrolment <= 100)
-    if 'Total_Enrolment' in df.columns:
-        initial_count = len(df)
-        df = df[df['Total_Enrolment'] > 100].copy()
-        removed = initial_count - len(df)
-        if removed > 0:
-            st.sidebar.info(f"🧹 Removed {removed} ghost districts (enrolment ≤ 100)")
-    
-    # 3. Winsorize key metrics (cap at 0-100%)
-    metrics_to_winsorize = ['Migration_Intensity', 'Biometric_Lag', 'Digital_Penetration']
-    for col in metrics_to_winsorize:
-        if col in df.columns:
-            df[col] = df[col].clip(0, 100)
-    
-    # 4. Calculate derived metrics
-    if 'Migration_Intensity' in df.columns and 'Biometric_Lag' in df.columns:
-        df['Risk_Score'] = (df['Migration_Intensity'] * df['Biometric_Lag']) / 100
-    
-    # 5. Handle missing values (before creating categories)
-    numeric_cols = df.select_dtypes(include=[np.number]).columns
-    df[numeric_cols] = df[numeric_cols].fillna(0)
-    
-    # 6. Create risk categories
-    if 'Risk_Score' in df.columns:
-        df['Risk_Category'] = pd.cut(
-            df['Risk_Score'],
-            bins=[0, 30, 50, 70, 100],
-            labels=['Low', 'Medium', 'High', 'Critical']
-        )
+        # Normalization, ghost removal, winsorization, missing values and
+        # risk scores come from the shared engine, cached per file content
+        df, report = load_processed_data(data_path)
+    
+    removed = report['ghost_districts_removed']
+    if removed > 0:
+        st.sidebar.info(f"🧹 Removed {removed} ghost districts (enrolment ≤ {GHOST_THRESHOLD})")
     
     return df
 
 
+@st.cache_resource(max_entries=2)
+def get_filter_index(data_fingerprint=None):
+    """Cleaned data plus its filter index, built once per dataset
+    
+    Shared by all sessions without copying, unlike `st.cache_data`
+    results, so the indexed frame must be treated as read-only.
+    """
+    return FilterIndex(load_and_clean_data(data_fingerprint))
+
+
+@st.cache_resource(max_entries=2)
+def get_state_cube(data_fingerprint=None):
+    """State × risk category × migration decile aggregates, built once per dataset"""
+    return StateCube(get_filter_index(data_fingerprint).df)
+
+
+@st.cache_resource(max_entries=2)
+def get_search_index(data_fingerprint=None):
+    """District/state name search index, built once per dataset"""
+    return SearchIndex(get_filter_index(data_fingerprint).df)
+
+
+# ============================================================================
+# CACHED AGGREGATES
+# ============================================================================
+# Filter combinations kept per aggregate; shared by every session, so
+# officers viewing the same state reuse one result
+AGGREGATE_CACHE_ENTRIES = 256
+
+def state_filter(selected_state):
+    """Sidebar state selection as a filter value (None = All India)"""
+    return None if selected_state == 'All India' else selected_state
+
+def filter_view(data_fingerprint, selected_state, migration_range):
+    """Rows behind a (state, migration range) view"""
+    return get_filter_index(data_fingerprint).filter(
+        state=state_filter(selected_state),
+        low=migration_range[0],
+        high=migration_range[1]
+    )
+
+@st.cache_data(max_entries=AGGREGATE_CACHE_ENTRIES, show_spinner=False)
+def get_kpis(data_fingerprint, selected_state, migration_range):
+    """KPI numbers for one filter view (LRU-cached across sessions)"""
+    cube = get_state_cube(data_fingerprint)
+    if cube.covers(*migration_range):
+        return cube.kpi_summary(state_filter(selected_state), *migration_range)
+    return kpi_summary(filter_view(data_fingerprint, selected_state, migration_range))
+
+@st.cache_data(max_entries=AGGREGATE_CACHE_ENTRIES, show_spinner=False)
+def get_state_digital(data_fingerprint, selected_state, migration_range):
+    """Digital Divide state table for one filter view (LRU-cached across sessions)"""
+    cube = get_state_cube(data_fingerprint)
+    if cube.covers(*migration_range):
+        return cube.state_digital_summary(state_filter(selected_state), *migration_range)
+    return state_digital_summary(filter_view(data_fingerprint, selected_state, migration_range))
+
+@st.cache_data(max_entries=AGGREGATE_CACHE_ENTRIES, show_spinner=False)
+def get_treemap_nodes(data_fingerprint, selected_state, migration_range):
+    """Level-of-detail treemap leaves for one filter view (LRU-cached across sessions)"""
+    return treemap_nodes(filter_view(data_fingerprint, selected_state, migration_range),
+                         state=state_filter(selected_state))
+
+@st.cache_data(max_entries=AGGREGATE_CACHE_ENTRIES, show_spinner=False)
+def get_scatter_sample(data_fingerprint, selected_state, migration_range):
+    """Stratified Dual-Risk points for one large filter view (LRU-cached across sessions)"""
+    return scatter_sample(filter_view(data_fingerprint, selected_state, migration_range))
+
+@st.cache_data(max_entries=AGGREGATE_CACHE_ENTRIES, show_spinner=False)
+def get_density_grid(data_fingerprint, selected_state, migration_range):
+    """Binned Dual-Risk counts for one large filter view (LRU-cached across sessions)"""
+    return density_grid(filter_view(data_fingerprint, selected_state, migration_range))
+
+@st.cache_data(max_entries=AGGREGATE_CACHE_ENTRIES, show_spinner=False)
+def get_migration_histogram(data_fingerprint, selected_state, migration_range):
+    """Migration histogram bins for one filter view (LRU-cached across sessions)"""
+    return migration_histogram(filter_view(data_fingerprint, selected_state, migration_range))
+
+
+# ============================================================================
+# CACHED FIGURES
+# ============================================================================
+# Rendered charts kept per (chart, dataset, filter view). On a hit Streamlit
+# replays the stored chart element - the already-serialised figure JSON - so
+# reruns from unrelated widgets rebuild and re-serialise nothing
+FIGURE_CACHE_ENTRIES = 64
+
+@st.cache_data(max_entries=FIGURE_CACHE_ENTRIES, show_spinner=False)
+def show_treemap(data_fingerprint, selected_state, migration_range):
+    """Migration treemap for one filter view (rendered once, then replayed)"""
+    treemap_df, treemap_path = get_treemap_nodes(data_fingerprint, selected_state, migration_range)
+    treemap_level = treemap_path[-1]
+    fig_treemap = px.treemap(
+        treemap_df,
+        path=treemap_path,
+        values='Total_Enrolment',
+        color='Migration_Intensity',
+        color_continuous_scale='RdYlGn_r',
+        hover_data=['Districts'],
+        title=f"Migration Intensity by {treemap_level} ({selected_state})"
+    )
+    fig_treemap.update_traces(
+        textfont=dict(
+            size=16, 
+            color='black', 
+            family='Arial, Helvetica, sans-serif'
+        ),
+        textposition='middle center',
+        marker=dict(
+            line=dict(width=2, color='white'),
+            colorbar=dict(thickness=15, len=0.7),
+            pad=dict(t=20, l=10, r=10, b=10)
+        ),
+        texttemplate='<b>%{label}</b>',
+    )
+    fig_treemap.update_layout(
+        height=600,
+        font=dict(size=16, color='black', family='Arial, Helvetica, sans-serif'),
+        paper_bgcolor='white',
+        plot_bgcolor='white',
+        title=dict(
+            text=f"Migration Intensity by {treemap_level} ({selected_state})",
+            font=dict(size=24, color='#000080', family='Arial, Helvetica, sans-serif', weight='bold'),
+            x=0.5,
+            xanchor='center',
+            y=0.98,
+            yanchor='top'
+        )
+    )
+    st.plotly_chart(fig_treemap, use_container_width=True, config={'displayModeBar': True})
+    if treemap_level == 'State':
+        st.caption(f"More than {TREEMAP_NODE_BUDGET} districts: showing state totals. "
+                   "Select a state in the sidebar to see its districts.")
+
+@st.cache_data(max_entries=FIGURE_CACHE_ENTRIES, show_spinner=False)
+def show_risk_matrix(data_fingerprint, selected_state, migration_range, scatter_view="All points"):
+    """Dual-Risk Matrix for one filter view and large-view mode (rendered once, then replayed)"""
+    if scatter_view == "Density":
+        x_centres, y_centres, counts = get_density_grid(data_fingerprint, selected_state, migration_range)
+        fig_scatter = go.Figure(go.Heatmap(
+            x=x_centres, y=y_centres, z=counts,
+            colorscale='YlOrRd', colorbar=dict(title="Districts")
+        ))
+        fig_scatter.update_layout(
+            title="Risk Assessment Matrix (district density)",
+            xaxis_title='Migration_Intensity', yaxis_title='Biometric_Lag'
+        )
+    else:
+        # Risk scatter plot
+        if scatter_view == "All points":
+            points = filter_view(data_fingerprint, selected_state, migration_range)
+        else:
+            points = get_scatter_sample(data_fingerprint, selected_state, migration_range)
+        fig_scatter = px.scatter(
+            points,
+            x='Migration_Intensity',
+            y='Biometric_Lag',
+            size='Risk_Score',
+            color='Digital_Penetration',
+            hover_data=['State', 'District', 'Risk_Score'],
+            color_continuous_scale='RdYlGn',
+            render_mode='auto' if scatter_view == "All points" else 'webgl',
+            title="Risk Assessment Matrix"
+        )
+    
+    # Add quadrant lines
+    fig_scatter.add_hline(y=70, line_dash="dash", line_color="red", opacity=0.5)
+    fig_scatter.add_vline(x=70, line_dash="dash", line_color="red", opacity=0.5)
+    
+    fig_scatter.update_layout(height=600)
+    st.plotly_chart(fig_scatter, use_container_width=True)
+
+@st.cache_data(max_entries=FIGURE_CACHE_ENTRIES, show_spinner=False)
+def show_migration_histogram(data_fingerprint, selected_state, migration_range):
+    """User dashboard migration histogram for one filter view (rendered once, then replayed)"""
+    histogram = get_migration_histogram(data_fingerprint, selected_state, migration_range)
+    fig_hist = px.bar(
+        histogram,
+        x='Migration_Intensity',
+        y='Districts',
+        title="Distribution of Migration Intensity",
+        labels={'Migration_Intensity': 'Migration Intensity (%)'}
+    )
+    fig_hist.update_traces(width=histogram['Bin_Width'])
+    fig_hist.update_layout(height=400, showlegend=False, bargap=0)
+    st.plotly_chart(fig_hist, use_container_width=True)
+
+@st.cache_data(max_entries=FIGURE_CACHE_ENTRIES, show_spinner=False)
+def show_digital_bar(data_fingerprint, selected_state, migration_range):
+    """Digital penetration by state for one filter view (rendered once, then replayed)"""
+    fig_bar = px.bar(
+        get_state_digital(data_fingerprint, selected_state, migration_range),
+        x='State',
+        y='Avg_Digital_Penetration',
+        color='Avg_Digital_Penetration',
+        color_continuous_scale='RdYlGn',
+        title="Average Digital Penetration by State"
+    )
+    fig_bar.update_layout(height=500, xaxis_tickangle=-45)
+    st.plotly_chart(fig_bar, use_container_width=True)
+
+
 def ai_assistant(query, df):
     """Rule-based AI assistant for answering questions about the data"""
     query = query.lower()
@@ -463,7 +713,256 @@ def ai_assistant(query, df):
     else:
         return "🤔 I didn't understand that. Try asking about 'highest risk', 'digital divide', 'migration', or type 'help' for more options."
 
+# ============================================================================
+# DASHBOARD FRAGMENTS
+# ============================================================================
+# Each panel is an st.fragment, so a widget inside it reruns only that panel.
+# Shared state is passed in explicitly; on a fragment rerun Streamlit reuses
+# the arguments of the last full run, and only the sidebar filters (or a
+# logout) rerun the whole dashboard.
+
+@st.fragment
+def assistant_panel(data_fingerprint):
+    """Sidebar AI assistant (answers over the full dataset)"""
+    st.markdown("#### 🤖 AI Assistant")
+    user_query = st.text_input("Ask me anything:", placeholder="e.g., Where is the highest risk?")
+    if user_query:
+        with st.expander("💬 Response", expanded=True):
+            st.markdown(ai_assistant(user_query, get_filter_index(data_fingerprint).df))
+
+@st.fragment
+def export_panel(view_key):
+    """Sidebar filtered-CSV export (admin only)"""
+    st.markdown("#### 📥 Export Data")
+    # Serialised only after the click, and only the filtered rows
+    if st.button("Download Filtered CSV"):
+        st.download_button(
+            label="💾 Download CSV",
+            data=export_csv(filter_view(*view_key)),
+            file_name="uidai_filtered_data.csv",
+            mime="text/csv",
+            on_click="ignore"
+        )
+
+@st.fragment
+def kpi_panel(kpis):
+    """Headline KPI cards for the current filter view"""
+    st.markdown("### 📊 Key Performance Indicators")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.markdown("""
+        <div class="kpi-card">
+            <div class="kpi-label">Total Districts</div>
+            <div class="kpi-value">{:,}</div>
+        </div>
+        """.format(kpis['districts']), unsafe_allow_html=True)
+    
+    with col2:
+        avg_risk = kpis['avg_risk']
+        st.markdown("""
+        <div class="kpi-card">
+            <div class="kpi-label">Avg Risk Score</div>
+            <div class="kpi-value">{:.1f}</div>
+        </div>
+        """.format(avg_risk), unsafe_allow_html=True)
+    
+    with col3:
+        critical_districts = kpis['critical_districts']
+        st.markdown("""
+        <div class="kpi-card">
+            <div class="kpi-label">Critical Districts</div>
+            <div class="kpi-value" style="color: #ff0000;">{:,}</div>
+        </div>
+        """.format(critical_districts), unsafe_allow_html=True)
+    
+    with col4:
+        total_enrolment = kpis['total_enrolment']
+        st.markdown("""
+        <div class="kpi-card">
+            <div class="kpi-label">Total Enrolments</div>
+            <div class="kpi-value">{:,.0f}</div>
+        </div>
+        """.format(total_enrolment), unsafe_allow_html=True)
+
+@st.fragment
+def migration_monitor_tab(view_key, filtered_df):
+    """Migration treemap and top migration districts"""
+    st.markdown("### 🗺️ Migration Intensity Treemap")
+    st.markdown("Visualizing enrolment volume and migration stress across districts")
+    
+    if len(filtered_df) > 0:
+        # Treemap over at most TREEMAP_NODE_BUDGET aggregated leaves (cached figure)
+        show_treemap(*view_key)
+    
+        # Top migration districts
+        st.markdown("#### 🔝 Top 10 High Migration Districts")
+        top_migration = filtered_df.nlargest(10, 'Migration_Intensity')[
+            ['State', 'District', 'Migration_Intensity', 'Total_Enrolment']
+        ]
+        st.dataframe(top_migration, use_container_width=True)
+    else:
+        st.warning("No data available for selected filters.")
+
+@st.fragment
+def risk_assessment_tab(view_key, filtered_df):
+    """Admin Dual-Risk Matrix and critical district alerts"""
+    st.markdown("### ⚠️ Dual-Risk Matrix")
+    st.markdown("Migration vs Biometric Lag - sized by risk score, colored by digital penetration")
+    
+    if len(filtered_df) > 0:
+        # Large views: WebGL sample (all critical points kept) or server-side density
+        scatter_view = "All points"
+        if len(filtered_df) > SCATTER_POINT_LIMIT:
+            scatter_view = st.radio(
+                "Large view mode:", ["Sampled points", "Density"], horizontal=True
+            )
+            st.caption(f"{len(filtered_df):,} districts exceed the {SCATTER_POINT_LIMIT:,}-point limit. "
+                       "The sample keeps every district above 70/70 plus a state × quadrant "
+                       "sample of the rest; the alert count and table below use all districts.")
+    
+        show_risk_matrix(*view_key, scatter_view)
+    
+        # Risk alerts
+        critical = filtered_df[
+            (filtered_df['Migration_Intensity'] > 70) & 
+            (filtered_df['Biometric_Lag'] > 70)
+        ]
+    
+        if len(critical) > 0:
+            st.markdown("""
+            <div class="alert-box alert-critical">
+                <strong>🚨 CRITICAL ALERT:</strong> {} districts exceed BOTH 70% migration intensity 
+                AND 70% biometric lag. Immediate deployment of mobile enrolment kits recommended.
+            </div>
+            """.format(len(critical)), unsafe_allow_html=True)
+    
+            st.dataframe(
+                critical[['State', 'District', 'Migration_Intensity', 'Biometric_Lag', 'Risk_Score']],
+                use_container_width=True
+            )
+    else:
+        st.warning("No data available for selected filters.")
+
+@st.fragment
+def user_dashboard_tab(view_key, filtered_df, kpis):
+    """User summary metrics, migration histogram and top districts"""
+    st.markdown("### 📊 My Dashboard")
+    st.markdown("Overview of migration statistics and key metrics")
+    
+    if len(filtered_df) > 0:
+        # Summary statistics for users
+        col1, col2 = st.columns(2)
+    
+        with col1:
+            avg_migration = kpis['avg_migration']
+            st.metric("Average Migration Intensity", f"{avg_migration:.1f}%")
+    
+            total_districts = kpis['districts']
+            st.metric("Total Districts", f"{total_districts:,}")
+    
+        with col2:
+            high_migration = kpis['high_migration']
+            st.metric("High Migration Districts", f"{high_migration:,}")
+    
+            total_enrol = kpis['total_enrolment']
+            st.metric("Total Enrolments", f"{total_enrol:,.0f}")
+    
+        st.markdown("---")
+    
+        # Migration trend chart for users
+        st.markdown("#### 📈 Migration Intensity Distribution")
+        show_migration_histogram(*view_key)
+    
+        # Top 5 districts for users
+        st.markdown("#### 🔝 Top 5 Districts by Migration")
+        top_5 = filtered_df.nlargest(5, 'Migration_Intensity')[
+            ['District', 'State', 'Migration_Intensity', 'Total_Enrolment']
+        ]
+        st.dataframe(top_5, use_container_width=True, hide_index=True)
+    else:
+        st.warning("No data available for selected filters.")
+
+@st.fragment
+def digital_divide_tab(view_key, filtered_df):
+    """Admin digital penetration by state and its dark spots"""
+    st.markdown("### 📱 Digital Penetration Heatmap")
+    st.markdown("Identifying districts with lowest mobile linkage and digital readiness")
+    
+    if len(filtered_df) > 0:
+        # State-level aggregation (cached per filter view)
+        state_digital = get_state_digital(*view_key)
+    
+        # Bar chart (cached figure)
+        show_digital_bar(*view_key)
+    
+        # Bottom 5 states
+        st.markdown("#### 📉 Bottom 5 States - Digital Dark Spots")
+        bottom_states = state_digital.head(5)
+    
+        st.markdown("""
+        <div class="alert-box alert-warning">
+            <strong>⚠️ ATTENTION:</strong> These states require IVRS reminders, 
+            offline grievance desks, and assisted Aadhaar update facilities.
+        </div>
+        """, unsafe_allow_html=True)
+    
+        st.dataframe(bottom_states, use_container_width=True)
+    else:
+        st.warning("No data available for selected filters.")
+
+@st.fragment
+def raw_data_tab(view_key, filtered_df):
+    """Admin paged, searchable data explorer with full export"""
+    data_fingerprint, selected_state, migration_range = view_key
+    filter_index = get_filter_index(data_fingerprint)
+    df = filter_index.df
+    
+    st.markdown("### 📋 Filtered Data Explorer")
+    st.markdown(f"Showing **{len(filtered_df)}** records")
+    
+    # Display options
+    col1, col2, col3 = st.columns([3, 1, 1])
+    with col1:
+        search_term = st.text_input("🔍 Search districts:", placeholder="Type to filter...")
+        search_mode = st.radio("Match:", SEARCH_MODES, horizontal=True, label_visibility="collapsed")
+    with col2:
+        rows_to_show = st.selectbox("Rows per page:", PAGE_SIZES, index=1)
+    
+    # Filter by search: index lookup intersected with the filtered rows
+    display_df = filtered_df
+    if search_term.strip():
+        matches = get_search_index(data_fingerprint).lookup(search_term, search_mode)
+        view = filter_index.positions(state_filter(selected_state), *migration_range)
+        display_df = df.take(np.intersect1d(view, matches, assume_unique=True))
+    
+    # Only the current page is sent to the browser
+    with col3:
+        page = st.number_input("Page:", min_value=1, max_value=page_count(len(display_df), rows_to_show),
+                               value=1, step=1)
+    page_df, (first_row, last_row) = page_slice(display_df, page, rows_to_show)
+    
+    st.dataframe(
+        page_df,
+        use_container_width=True,
+        height=400
+    )
+    st.caption(f"Rows {first_row:,}–{last_row:,} of {len(display_df):,}")
+    
+    # Export is generated in chunks, and only when requested
+    if st.button("📦 Prepare Full Filtered Export"):
+        st.download_button(
+            label="📥 Download Full Filtered Data",
+            data=export_csv(display_df),
+            file_name=f"uidai_export_{selected_state.replace(' ', '_').lower()}.csv",
+            mime="text/csv",
+            on_click="ignore"
+        )
+
 def main():
+    sync_session_cookie()
+
     # Header
     st.markdown("""
     <div class="main-header">
@@ -474,7 +973,8 @@ def main():
     
     # Load data
     with st.spinner("🔄 Loading and cleaning UIDAI data..."):
-        df = load_and_clean_data()
+        data_fingerprint = source_fingerprint(DATA_PATH)
+        filter_index = get_filter_index(data_fingerprint)
     
     
     with st.sidebar:
@@ -492,7 +992,7 @@ def main():
         
         # Region selector
         st.markdown("#### 📍 Region Selection")
-        all_states = ['All India'] + sorted(df['State'].unique().tolist())
+        all_states = ['All India'] + filter_index.states
         selected_state = st.selectbox("Select State:", all_states)
         
         # Migration intensity filter
@@ -510,81 +1010,28 @@ def main():
         
         st.markdown("---")
         
-        # AI Assistant
-        st.markdown("#### 🤖 AI Assistant")
-        user_query = st.text_input("Ask me anything:", placeholder="e.g., Where is the highest risk?")
-        if user_query:
-            with st.expander("💬 Response", expanded=True):
-                st.markdown(ai_assistant(user_query, df))
+        # Index lookup + searchsorted; only the matching rows are materialised
+        filtered_df = filter_view(data_fingerprint, selected_state, migration_range)
+        
+        # Memoised per (dataset, state, range) and shared across sessions
+        view_key = (data_fingerprint, selected_state, tuple(migration_range))
+        kpis = get_kpis(*view_key)
+        
+        # AI Assistant (reruns on its own)
+        assistant_panel(data_fingerprint)
         
         st.markdown("---")
         
         # Export (admin only)
         if st.session_state.user_role == 'admin':
-            st.markdown("#### 📥 Export Data")
-            if st.button("Download Filtered CSV"):
-                csv = df.to_csv(index=False)
-                st.download_button(
-                    label="💾 Download CSV",
-                    data=csv,
-                    file_name="uidai_filtered_data.csv",
-                    mime="text/csv"
-                )
-    
-
-    filtered_df = df.copy()
-    
-    if selected_state != 'All India':
-        filtered_df = filtered_df[filtered_df['State'] == selected_state]
-    
-    filtered_df = filtered_df[
-        (filtered_df['Migration_Intensity'] >= migration_range[0]) &
-        (filtered_df['Migration_Intensity'] <= migration_range[1])
-    ]
-    
-   
-    st.markdown("### 📊 Key Performance Indicators")
-    
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.markdown("""
-        <div class="kpi-card">
-            <div class="kpi-label">Total Districts</div>
-            <div class="kpi-value">{:,}</div>
-        </div>
-        """.format(len(filtered_df)), unsafe_allow_html=True)
-    
-    with col2:
-        avg_risk = filtered_df['Risk_Score'].mean()
-        st.markdown("""
-        <div class="kpi-card">
-            <div class="kpi-label">Avg Risk Score</div>
-            <div class="kpi-value">{:.1f}</div>
-        </div>
-        """.format(avg_risk), unsafe_allow_html=True)
+            export_panel(view_key)
     
-    with col3:
-        critical_districts = len(filtered_df[filtered_df['Risk_Score'] > 70])
-        st.markdown("""
-        <div class="kpi-card">
-            <div class="kpi-label">Critical Districts</div>
-            <div class="kpi-value" style="color: #ff0000;">{:,}</div>
-        </div>
-        """.format(critical_districts), unsafe_allow_html=True)
-    
-    with col4:
-        total_enrolment = filtered_df['Total_Enrolment'].sum()
-        st.markdown("""
-        <div class="kpi-card">
-            <div class="kpi-label">Total Enrolments</div>
-            <div class="kpi-value">{:,.0f}</div>
-        </div>
-        """.format(total_enrolment), unsafe_allow_html=True)
+    kpi_panel(kpis)
     
     st.markdown("---")
     
-    # Role-based tab access
+    # Role-based tab access. Tabs are lazy: selecting one reruns the page, and
+    # only the open tab's fragment runs, so a rerun costs one tab, not all
     if st.session_state.user_role == 'admin':
         # Admin sees all tabs
         tab1, tab2, tab3, tab4 = st.tabs([
@@ -592,248 +1039,31 @@ def main():
             "⚠️ Risk Assessment",
             "📉 Digital Divide",
             "🗂️ Raw Data"
-        ])
+        ], key="admin_tabs", on_change="rerun")
+        if tab1.open:
+            with tab1:
+                migration_monitor_tab(view_key, filtered_df)
+        if tab2.open:
+            with tab2:
+                risk_assessment_tab(view_key, filtered_df)
+        if tab3.open:
+            with tab3:
+                digital_divide_tab(view_key, filtered_df)
+        if tab4.open:
+            with tab4:
+                raw_data_tab(view_key, filtered_df)
     else:
         # Regular users see limited tabs
         tab1, tab2 = st.tabs([
             "🌍 Migration Monitor",
             "📊 My Dashboard"
-        ])
-    
-    # ------------------------------------------------------------------------
-    # TAB 1: MIGRATION MONITOR
-    # ------------------------------------------------------------------------
-    with tab1:
-        st.markdown("### 🗺️ Migration Intensity Treemap")
-        st.markdown("Visualizing enrolment volume and migration stress across districts")
-        
-        if len(filtered_df) > 0:
-            # Treemap
-            fig_treemap = px.treemap(
-                filtered_df,
-                path=['State', 'District'],
-                values='Total_Enrolment',
-                color='Migration_Intensity',
-                color_continuous_scale='RdYlGn_r',
-                title=f"Migration Intensity by District ({selected_state})"
-            )
-            fig_treemap.update_traces(
-                textfont=dict(
-                    size=16, 
-                    color='black', 
-                    family='Arial, Helvetica, sans-serif'
-                ),
-                textposition='middle center',
-                marker=dict(
-                    line=dict(width=2, color='white'),
-                    colorbar=dict(thickness=15, len=0.7),
-                    pad=dict(t=20, l=10, r=10, b=10)
-                ),
-                texttemplate='<b>%{label}</b>',
-            )
-            fig_treemap.update_layout(
-                height=600,
-                font=dict(size=16, color='black', family='Arial, Helvetica, sans-serif'),
-                paper_bgcolor='white',
-                plot_bgcolor='white',
-                title=dict(
-                    text=f"Migration Intensity by District ({selected_state})",
-                    font=dict(size=24, color='#000080', family='Arial, Helvetica, sans-serif', weight='bold'),
-                    x=0.5,
-                    xanchor='center',
-                    y=0.98,
-                    yanchor='top'
-                )
-            )
-            st.plotly_chart(fig_treemap, use_container_width=True, config={'displayModeBar': True})
-            
-            # Top migration districts
-            st.markdown("#### 🔝 Top 10 High Migration Districts")
-            top_migration = filtered_df.nlargest(10, 'Migration_Intensity')[
-                ['State', 'District', 'Migration_Intensity', 'Total_Enrolment']
-            ]
-            st.dataframe(top_migration, use_container_width=True)
-        else:
-            st.warning("No data available for selected filters.")
-    
-    # ------------------------------------------------------------------------
-    # TAB 2: CONDITIONAL CONTENT BASED ON ROLE
-    # ------------------------------------------------------------------------
-    with tab2:
-        if st.session_state.user_role == 'admin':
-            # ADMIN: Risk Assessment
-            st.markdown("### ⚠️ Dual-Risk Matrix")
-            st.markdown("Migration vs Biometric Lag - sized by risk score, colored by digital penetration")
-            
-            if len(filtered_df) > 0:
-                # Risk scatter plot
-                fig_scatter = px.scatter(
-                    filtered_df,
-                    x='Migration_Intensity',
-                    y='Biometric_Lag',
-                    size='Risk_Score',
-                    color='Digital_Penetration',
-                    hover_data=['State', 'District', 'Risk_Score'],
-                    color_continuous_scale='RdYlGn',
-                    title="Risk Assessment Matrix"
-                )
-                
-                # Add quadrant lines
-                fig_scatter.add_hline(y=70, line_dash="dash", line_color="red", opacity=0.5)
-                fig_scatter.add_vline(x=70, line_dash="dash", line_color="red", opacity=0.5)
-                
-                fig_scatter.update_layout(height=600)
-                st.plotly_chart(fig_scatter, use_container_width=True)
-                
-                # Risk alerts
-                critical = filtered_df[
-                    (filtered_df['Migration_Intensity'] > 70) & 
-                    (filtered_df['Biometric_Lag'] > 70)
-                ]
-                
-                if len(critical) > 0:
-                    st.markdown("""
-                    <div class="alert-box alert-critical">
-                        <strong>🚨 CRITICAL ALERT:</strong> {} districts exceed BOTH 70% migration intensity 
-                        AND 70% biometric lag. Immediate deployment of mobile enrolment kits recommended.
-                    </div>
-                    """.format(len(critical)), unsafe_allow_html=True)
-                    
-                    st.dataframe(
-                        critical[['State', 'District', 'Migration_Intensity', 'Biometric_Lag', 'Risk_Score']],
-                        use_container_width=True
-                    )
-            else:
-                st.warning("No data available for selected filters.")
-        else:
-            # USER: Simple Dashboard
-            st.markdown("### 📊 My Dashboard")
-            st.markdown("Overview of migration statistics and key metrics")
-            
-            if len(filtered_df) > 0:
-                # Summary statistics for users
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    avg_migration = filtered_df['Migration_Intensity'].mean()
-                    st.metric("Average Migration Intensity", f"{avg_migration:.1f}%")
-                    
-                    total_districts = len(filtered_df)
-                    st.metric("Total Districts", f"{total_districts:,}")
-                
-                with col2:
-                    high_migration = len(filtered_df[filtered_df['Migration_Intensity'] > 70])
-                    st.metric("High Migration Districts", f"{high_migration:,}")
-                    
-                    total_enrol = filtered_df['Total_Enrolment'].sum()
-                    st.metric("Total Enrolments", f"{total_enrol:,.0f}")
-                
-                st.markdown("---")
-                
-                # Migration trend chart for users
-                st.markdown("#### 📈 Migration Intensity Distribution")
-                fig_hist = px.histogram(
-                    filtered_df,
-                    x='Migration_Intensity',
-                    nbins=20,
-                    title="Distribution of Migration Intensity",
-                    labels={'Migration_Intensity': 'Migration Intensity (%)'}
-                )
-                fig_hist.update_layout(height=400, showlegend=False)
-                st.plotly_chart(fig_hist, use_container_width=True)
-                
-                # Top 5 districts for users
-                st.markdown("#### 🔝 Top 5 Districts by Migration")
-                top_5 = filtered_df.nlargest(5, 'Migration_Intensity')[
-                    ['District', 'State', 'Migration_Intensity', 'Total_Enrolment']
-                ]
-                st.dataframe(top_5, use_container_width=True, hide_index=True)
-            else:
-                st.warning("No data available for selected filters.")
-    
-    # Admin-only tabs
-    if st.session_state.user_role == 'admin':
-        # ------------------------------------------------------------------------
-        # TAB 3: DIGITAL DIVIDE (ADMIN ONLY)
-        # ------------------------------------------------------------------------
-        with tab3:
-            st.markdown("### 📱 Digital Penetration Heatmap")
-            st.markdown("Identifying districts with lowest mobile linkage and digital readiness")
-            
-            if len(filtered_df) > 0:
-                # State-level aggregation
-                state_digital = filtered_df.groupby('State').agg({
-                    'Digital_Penetration': 'mean',
-                    'Mobile_Linkage_Rate': 'mean',
-                    'District': 'count'
-                }).reset_index()
-                state_digital.columns = ['State', 'Avg_Digital_Penetration', 'Avg_Mobile_Linkage', 'District_Count']
-                state_digital = state_digital.sort_values('Avg_Digital_Penetration')
-                
-                # Bar chart
-                fig_bar = px.bar(
-                    state_digital,
-                    x='State',
-                    y='Avg_Digital_Penetration',
-                    color='Avg_Digital_Penetration',
-                    color_continuous_scale='RdYlGn',
-                    title="Average Digital Penetration by State"
-                )
-                fig_bar.update_layout(height=500, xaxis_tickangle=-45)
-                st.plotly_chart(fig_bar, use_container_width=True)
-                
-                # Bottom 5 states
-                st.markdown("#### 📉 Bottom 5 States - Digital Dark Spots")
-                bottom_states = state_digital.head(5)
-                
-                st.markdown("""
-                <div class="alert-box alert-warning">
-                    <strong>⚠️ ATTENTION:</strong> These states require IVRS reminders, 
-                    offline grievance desks, and assisted Aadhaar update facilities.
-                </div>
-                """, unsafe_allow_html=True)
-                
-                st.dataframe(bottom_states, use_container_width=True)
-            else:
-                st.warning("No data available for selected filters.")
-        
-        # ------------------------------------------------------------------------
-        # TAB 4: RAW DATA (ADMIN ONLY)
-        # ------------------------------------------------------------------------
-        with tab4:
-            st.markdown("### 📋 Filtered Data Explorer")
-            st.markdown(f"Showing **{len(filtered_df)}** records")
-            
-            # Display options
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                search_term = st.text_input("🔍 Search districts:", placeholder="Type to filter...")
-            with col2:
-                rows_to_show = st.selectbox("Rows per page:", [10, 25, 50, 100], index=1)
-            
-            # Filter by search
-            display_df = filtered_df
-            if search_term:
-                display_df = display_df[
-                    display_df['District'].str.contains(search_term, case=False) |
-                    display_df['State'].str.contains(search_term, case=False)
-                ]
-            
-            # Display dataframe
-            st.dataframe(
-                display_df.head(rows_to_show),
-                use_container_width=True,
-                height=400
-            )
-            
-            # Export button
-            csv = display_df.to_csv(index=False)
-            st.download_button(
-                label="📥 Download Full Filtered Data",
-                data=csv,
-                file_name=f"uidai_export_{selected_state.replace(' ', '_').lower()}.csv",
-                mime="text/csv"
-            )
+        ], key="user_tabs", on_change="rerun")
+        if tab1.open:
+            with tab1:
+                migration_monitor_tab(view_key, filtered_df)
+        if tab2.open:
+            with tab2:
+                user_dashboard_tab(view_key, filtered_df, kpis)
     
     # ========================================================================
     # FOOTER
@@ -851,7 +1081,7 @@ def main():
 
 if __name__ == "__main__":
     # Check authentication status
-    if not st.session_state.authenticated:
+    if not st.session_state.authenticated and not restore_session():
         show_login_page()
     else:
         main()
@@ -1,45 +1,116 @@
 """
 Create initial admin user for UIDAI Dashboard
+
+Usage:
+    python create_admin.py                                  # create/reset admin + demo
+    python create_admin.py --import officers.csv            # bulk-create users from a roster
+    python create_admin.py --import officers.jsonl --dry-run --workers 8
+
+Rosters are CSV (header: username,password,email,role) or JSONL with the
+same keys; role defaults to --default-role. The import is all or nothing:
+any invalid row, duplicate or existing username aborts it before anything
+is written.
 """
 
-import json
-import hashlib
+import argparse
+import sys
+import time
 from datetime import datetime
 
-def hash_password(password):
-    """Hash password using SHA-256"""
-    return hashlib.sha256(password.encode()).hexdigest()
-
-# Create initial admin user
-users = {
-    "admin": {
-        "password": hash_password("admin123"),
-        "email": "admin@uidai.gov.in",
-        "role": "admin",
-        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    },
-    "demo": {
-        "password": hash_password("demo123"),
-        "email": "demo@uidai.gov.in",
-        "role": "user",
-        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+from src.passwords import PasswordHasher, load_params
+from src.provisioning import provision_users
+from src.user_store import USER_ROLES, open_user_store
+
+
+def create_default_users(store):
+    """Create (or reset) the admin and demo accounts"""
+    # Same calibrated KDF parameters as the dashboard (.password_params.json)
+    hasher = PasswordHasher.calibrated()
+
+    def hash_password(password):
+        """Hash password with the deployment's calibrated KDF"""
+        return hasher.hash(password)
+
+    # Create initial admin user
+    users = {
+        "admin": {
+            "password": hash_password("admin123"),
+            "email": "admin@uidai.gov.in",
+            "role": "admin",
+            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        },
+        "demo": {
+            "password": hash_password("demo123"),
+            "email": "demo@uidai.gov.in",
+            "role": "user",
+            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
     }
-}
-
-# Save to file
-with open("user_database.json", "w") as f:
-    json.dump(users, f, indent=4)
-
-print("✅ Initial users created successfully!")
-print("\n📋 Login Credentials:")
-print("-" * 50)
-print("Admin User:")
-print("  Username: admin")
-print("  Password: admin123")
-print("  Role: admin")
-print("\nDemo User:")
-print("  Username: demo")
-print("  Password: demo123")
-print("  Role: user")
-print("-" * 50)
-print("\n⚠️  Please change these passwords after first login!")
+
+    # Save to the configured user store (UIDAI_USER_STORE), resetting these
+    # two accounts and leaving every other user untouched
+    for username, record in users.items():
+        if not store.add(username, record):
+            store.update(username, **record)
+    hasher.shutdown()
+
+    print("✅ Initial users created successfully!")
+    print("\n📋 Login Credentials:")
+    print("-" * 50)
+    print("Admin User:")
+    print("  Username: admin")
+    print("  Password: admin123")
+    print("  Role: admin")
+    print("\nDemo User:")
+    print("  Username: demo")
+    print("  Password: demo123")
+    print("  Role: user")
+    print("-" * 50)
+    print("\n⚠️  Please change these passwords after first login!")
+
+
+def import_users(store, path, default_role, workers, dry_run):
+    """Bulk-create the users in a roster; returns the exit status"""
+    start = time.perf_counter()
+    try:
+        summary = provision_users(path, store, load_params(), default_role=default_role,
+                                  workers=workers, dry_run=dry_run)
+    except ValueError as e:
+        # Unreadable roster, or usernames created by someone else after validation
+        print(f"  ⚠ {e}")
+        print("❌ Import aborted: fix the rows above and re-run (nothing was written)")
+        return 1
+    elapsed = time.perf_counter() - start
+
+    if summary['errors']:
+        print("❌ Import aborted: fix the rows above and re-run (nothing was written)")
+        return 1
+    if dry_run:
+        print(f"✓ Dry run: {summary['valid']:,} users would be created")
+        return 0
+    print(f"✅ Created {summary['created']:,} users in {elapsed:.1f}s")
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Create UIDAI Dashboard users")
+    parser.add_argument('--import', dest='roster', metavar='PATH',
+                        help="CSV or JSONL roster of users to create")
+    parser.add_argument('--default-role', default='user', choices=USER_ROLES,
+                        help="role for roster rows without one")
+    parser.add_argument('--workers', type=int, help="hashing processes (default: all cores)")
+    parser.add_argument('--dry-run', action='store_true', help="validate the roster without writing")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    store = open_user_store()
+    if args.roster:
+        return import_users(store, args.roster, args.default_role, args.workers, args.dry_run)
+    create_default_users(store)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
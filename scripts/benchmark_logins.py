@@ -0,0 +1,172 @@
+"""
+UIDAI Pulse Login Throughput Benchmark
+Measures logins/s and latency for each password / session check the dashboard can use.
+
+Usage:
+    python scripts/benchmark_logins.py
+    python scripts/benchmark_logins.py --clients 1 4 16 --logins 200
+    python scripts/benchmark_logins.py --target-ms 250 --algorithm pbkdf2_sha256
+
+Scenarios (each against a temporary SQLite user store):
+    legacy_sha256  the old unsalted SHA-256 comparison
+    kdf            calibrated KDF, every login verified from scratch
+    kdf_cached     calibrated KDF with the verify cache warm (repeat logins in a burst)
+    session_token  page load with a signed session token (no password check at all)
+
+Each scenario is run with several concurrent clients. KDF work goes
+through the hasher's bounded thread pool, so throughput levels off at
+about workers / hash time however many clients there are.
+"""
+
+import argparse
+import hashlib
+import json
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+from src.passwords import DEFAULT_ALGORITHM, HASH_WORKERS, TARGET_HASH_SECONDS, PasswordHasher, calibrate
+from src.session_tokens import RevocationList, SessionTokens
+from src.user_store import SqliteUserStore
+
+BENCHMARK_DIR = PROJECT_ROOT / "artifacts" / "benchmarks"
+
+SCENARIOS = ['legacy_sha256', 'kdf', 'kdf_cached', 'session_token']
+DEFAULT_CLIENTS = [1, 4, 16]
+
+
+def build_store(workdir, users, hasher):
+    """User store with `users` accounts hashed both ways (legacy and KDF)"""
+    store = SqliteUserStore(Path(workdir) / "users.db", legacy_json=None)
+    for i in range(users):
+        password = f"password-{i}"
+        store.add(f"officer{i}", {
+            'password': hasher.hash(password), 'email': None, 'role': 'user', 'created_at': None
+        })
+        store.add(f"legacy{i}", {
+            'password': hashlib.sha256(password.encode()).hexdigest(), 'email': None, 'role': 'user',
+            'created_at': None
+        })
+    return store
+
+
+def login_functions(store, hasher, cold_hasher, tokens, users):
+    """One callable per scenario; each performs the i-th login and returns True on success"""
+    tokens_by_user = [tokens.issue(f"officer{i}", 'user') for i in range(users)]
+
+    def legacy(i):
+        user = store.get(f"legacy{i % users}")
+        return user['password'] == hashlib.sha256(f"password-{i % users}".encode()).hexdigest()
+
+    def kdf(i):
+        user = store.get(f"officer{i % users}")
+        return cold_hasher.verify(f"password-{i % users}", user['password'])[0]
+
+    def kdf_cached(i):
+        user = store.get(f"officer{i % users}")
+        return hasher.verify(f"password-{i % users}", user['password'])[0]
+
+    def session_token(i):
+        return tokens.verify(tokens_by_user[i % users]) is not None
+
+    return {
+        'legacy_sha256': legacy,
+        'kdf': kdf,
+        'kdf_cached': kdf_cached,
+        'session_token': session_token,
+    }
+
+
+def measure(login, logins, clients):
+    """Throughput and latency percentiles for `logins` logins over `clients` threads"""
+    latencies = []
+
+    def timed(i):
+        start = time.perf_counter()
+        ok = login(i)
+        latencies.append(time.perf_counter() - start)
+        return ok
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        results = list(pool.map(timed, range(logins)))
+    wall = time.perf_counter() - start
+
+    if not all(results):
+        raise RuntimeError("A benchmark login failed")
+    latencies.sort()
+    return {
+        'logins': logins,
+        'clients': clients,
+        'wall_s': round(wall, 4),
+        'logins_per_s': round(logins / wall, 1),
+        'p50_ms': round(statistics.median(latencies) * 1000, 3),
+        'p95_ms': round(latencies[int(0.95 * (len(latencies) - 1))] * 1000, 3),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark UIDAI Pulse login throughput")
+    parser.add_argument('--users', type=int, default=16, help="accounts per hash format")
+    parser.add_argument('--logins', type=int, default=64, help="logins per (scenario, clients)")
+    parser.add_argument('--clients', type=int, nargs='+', default=DEFAULT_CLIENTS)
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument('--target-ms', type=float, default=TARGET_HASH_SECONDS * 1000,
+                        help="KDF calibration target per hash")
+    parser.add_argument('--algorithm', default=DEFAULT_ALGORITHM, choices=['scrypt', 'pbkdf2_sha256'])
+    parser.add_argument('--workers', type=int, default=HASH_WORKERS, help="KDF thread pool size")
+    parser.add_argument('--output', type=Path, help="write results JSON here")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    params = calibrate(args.target_ms / 1000, args.algorithm)
+    print(f"🚀 Login benchmark: {params}, {args.workers} KDF workers")
+
+    hasher = PasswordHasher(params, workers=args.workers)
+    cold_hasher = PasswordHasher(params, workers=args.workers, cache_size=0)
+    results = []
+
+    with tempfile.TemporaryDirectory() as workdir:
+        store = build_store(workdir, args.users, hasher)
+        tokens = SessionTokens(b'benchmark-key', RevocationList(Path(workdir) / "revocations"))
+        logins = login_functions(store, hasher, cold_hasher, tokens, args.users)
+
+        # Warm the verify cache with one login per account
+        for i in range(args.users):
+            logins['kdf_cached'](i)
+
+        print(f"\n{'scenario':<15}{'clients':>8}{'logins/s':>12}{'p50 ms':>10}{'p95 ms':>10}")
+        for scenario in args.scenarios:
+            for clients in args.clients:
+                result = {'scenario': scenario, **measure(logins[scenario], args.logins, clients)}
+                results.append(result)
+                print(f"{scenario:<15}{clients:>8}{result['logins_per_s']:>12,.1f}"
+                      f"{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}")
+        store.close()
+
+    hasher.shutdown()
+    cold_hasher.shutdown()
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps({
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'params': params,
+            'workers': args.workers,
+            'results': results,
+        }, indent=2))
+        print(f"\n✓ Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,6 +3,7 @@ UIDAI Pulse Report Generator
 Generates a comprehensive PDF report with problem statement, methodology, insights, and code.
 """
 
+import sys
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
@@ -19,6 +20,15 @@ from reportlab.lib import colors
 from datetime import datetime
 import numpy as np
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.artifacts import find_columnar
+from src.cleaning import clean_master_data, load_processed_data
+
+REPORT_COLUMNS = [
+    'State', 'District', 'Total_Enrolment', 'Migration_Intensity',
+    'Biometric_Lag', 'Digital_Penetration', 'Risk_Score'
+]
+
 # Set style for matplotlib
 sns.set_style("whitegrid")
 plt.rcParams['figure.figsize'] = (10, 6)
@@ -82,7 +92,7 @@ class UIDaiReportGenerator:
         """Load and preprocess the dataset"""
         data_path = self.artifacts_dir / "final_master_data.csv"
         
-        if not data_path.exists():
+        if not data_path.exists() and find_columnar(data_path) is None:
             print(f"⚠️  Dataset not found at: {data_path}")
             print("📝 Creating sample dataset for demonstration...")
             
@@ -99,22 +109,10 @@ class UIDaiReportGenerator:
                 'Mobile_Linkage_Rate': np.random.uniform(45, 98, 100),
                 'Update_Frequency': np.random.uniform(5, 55, 100)
             })
-            df = sample_data
+            df, _ = clean_master_data(sample_data)
         else:
-            df = pd.read_csv(data_path)
-        
-        # Clean data
-        df['State'] = df['State'].astype(str).str.strip().str.upper()
-        df['District'] = df['District'].astype(str).str.strip().str.title()
-        df = df[df['Total_Enrolment'] > 100].copy()
-        
-        # Cap metrics at 100%
-        for col in ['Migration_Intensity', 'Biometric_Lag', 'Digital_Penetration']:
-            if col in df.columns:
-                df[col] = df[col].clip(0, 100)
-        
-        # Calculate risk score
-        df['Risk_Score'] = (df['Migration_Intensity'] * df['Biometric_Lag']) / 100
+            # Shared cleaning engine; reuses the dashboard's cached artifact
+            df, _ = load_processed_data(data_path, columns=REPORT_COLUMNS)
         
         return df
     
@@ -124,7 +122,7 @@ class UIDaiReportGenerator:
         
         # 1. Top States by Risk Score
         plt.figure(figsize=(10, 6))
-        state_risk = df.groupby('State')['Risk_Score'].mean().sort_values(ascending=False).head(10)
+        state_risk = df.groupby('State', observed=True)['Risk_Score'].mean().sort_values(ascending=False).head(10)
         state_risk.plot(kind='barh', color='#FF6B6B')
         plt.xlabel('Average Risk Score')
         plt.title('Top 10 States by Average Risk Score', fontsize=14, fontweight='bold')
@@ -160,7 +158,7 @@ class UIDaiReportGenerator:
         
         # 3. Digital Divide by State
         plt.figure(figsize=(12, 6))
-        state_digital = df.groupby('State')['Digital_Penetration'].mean().sort_values()
+        state_digital = df.groupby('State', observed=True)['Digital_Penetration'].mean().sort_values()
         colors_list = ['#FF6B6B' if x < 50 else '#FFD93D' if x < 70 else '#6BCB77' 
                        for x in state_digital.values]
         state_digital.plot(kind='bar', color=colors_list)
@@ -380,7 +378,7 @@ class UIDaiReportGenerator:
         
         migration_biometric_corr = df['Migration_Intensity'].corr(df['Biometric_Lag'])
         
-        low_digital_states = df.groupby('State')['Digital_Penetration'].mean().nsmallest(5)
+        low_digital_states = df.groupby('State', observed=True)['Digital_Penetration'].mean().nsmallest(5)
         
         insights_text = f"""
         <b>4.1 Critical Findings</b><br/><br/>
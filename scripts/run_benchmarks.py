@@ -0,0 +1,345 @@
+"""
+UIDAI Pulse Benchmark Suite
+Times the cleaning, pipeline, dashboard-filter and chart hot paths on synthetic data.
+
+Usage:
+    python scripts/run_benchmarks.py --sizes 1e3 1e4 1e5 1e6
+    python scripts/run_benchmarks.py --save-baseline
+    python scripts/run_benchmarks.py --stages clean filter --sizes 1e7
+
+Each (stage, size) runs in a fresh process so peak RSS is attributable to
+that stage. Results are written as JSON; with a stored baseline, any stage
+whose wall time or peak RSS grew past the tolerance is flagged and the
+script exits non-zero.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+from src.artifacts import read_master_data
+from src.aggregates import treemap_nodes
+from src import cache
+from src.cleaning import clean_master_data, load_processed_data
+from src.data_engineering import UidaiDataPipeline
+from src.filter_index import FilterIndex
+from src.synthetic import write_master_data_csv
+
+BENCHMARK_DIR = PROJECT_ROOT / "artifacts" / "benchmarks"
+DATA_DIR = PROJECT_ROOT / "artifacts" / "cache" / "benchmarks"
+BASELINE_PATH = BENCHMARK_DIR / "baseline.json"
+
+DEFAULT_SIZES = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]
+
+# A stage is flagged when it is this much slower/larger than the baseline...
+DEFAULT_TOLERANCE = 0.25
+# ...and the absolute difference is above the noise floor
+MIN_WALL_DELTA = 0.05
+MIN_RSS_DELTA = 16 * 1024 ** 2
+
+# Widget states replayed by the dashboard filter stage
+FILTER_INTERACTIONS = [
+    ('All India', (0, 100)),
+    ('All India', (40, 80)),
+    ('MAHARASHTRA', (0, 100)),
+    ('MAHARASHTRA', (60, 90)),
+    ('KERALA', (10, 50)),
+    ('UTTAR PRADESH', (70, 100)),
+]
+
+
+# ============================================================================
+# STAGES
+# ============================================================================
+def _quiet():
+    """Silence the pipeline's progress prints while timing"""
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def setup_raw(path, workdir):
+    return read_master_data(path)
+
+
+def run_clean(raw):
+    clean_master_data(raw)
+
+
+def setup_load_cold(path, workdir):
+    return path, workdir / "cache"
+
+
+def run_load(context):
+    path, cache_dir = context
+    load_processed_data(path, cache_dir=cache_dir)
+
+
+def reset_load_cold(context):
+    """Drop the processed-data cache and the in-process hash memo, so every repeat is cold"""
+    path, cache_dir = context
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    cache._hash_memo.clear()
+
+
+def setup_load_warm(path, workdir):
+    context = setup_load_cold(path, workdir)
+    run_load(context)
+    return context
+
+
+def setup_pipeline(path, workdir):
+    # Warm the processed-data cache so every timed run does the same work
+    load_processed_data(path)
+    return path
+
+
+def run_pipeline(path):
+    with _quiet():
+        UidaiDataPipeline(str(path)).run_full_pipeline()
+
+
+def setup_clean(path, workdir):
+    df, _ = clean_master_data(read_master_data(path))
+    return df
+
+
+def setup_filter_index(path, workdir):
+    # Built once per dataset in the dashboard (st.cache_resource)
+    return FilterIndex(setup_clean(path, workdir))
+
+
+def run_filter(index):
+    """Replay the filtering `app.py:main()` does on each widget interaction"""
+    for selected_state, migration_range in FILTER_INTERACTIONS:
+        index.filter(
+            state=None if selected_state == 'All India' else selected_state,
+            low=migration_range[0],
+            high=migration_range[1]
+        )
+
+
+def run_filter_scan(df):
+    """Reference: copy + boolean masks over the full frame per interaction"""
+    for selected_state, migration_range in FILTER_INTERACTIONS:
+        filtered_df = df.copy()
+        if selected_state != 'All India':
+            filtered_df = filtered_df[filtered_df['State'] == selected_state]
+        filtered_df = filtered_df[
+            (filtered_df['Migration_Intensity'] >= migration_range[0]) &
+            (filtered_df['Migration_Intensity'] <= migration_range[1])
+        ]
+
+
+def run_treemap(index):
+    """Build the tab-1 treemap figure JSON for All India and one state"""
+    payload = 0
+    for state in [None, index.states[0]]:
+        nodes, path = treemap_nodes(index.filter(state=state), state=state)
+        figure = px.treemap(nodes, path=path, values='Total_Enrolment', color='Migration_Intensity')
+        payload = max(payload, len(figure.to_json()))
+    return {'payload_bytes': payload}
+
+
+def setup_charts(path, workdir):
+    import matplotlib
+    matplotlib.use('Agg')
+    from scripts.generate_uidai_report import UIDaiReportGenerator
+
+    # Only the chart step is timed, so skip the PDF style setup
+    generator = UIDaiReportGenerator.__new__(UIDaiReportGenerator)
+    generator.report_assets_dir = workdir
+    return generator, setup_clean(path, workdir)
+
+
+def run_charts(context):
+    generator, df = context
+    generator.generate_charts(df)
+
+
+STAGES = {
+    'clean': (setup_raw, run_clean),
+    'load_cold': (setup_load_cold, run_load),
+    'load_warm': (setup_load_warm, run_load),
+    'pipeline': (setup_pipeline, run_pipeline),
+    'filter': (setup_filter_index, run_filter),
+    'filter_scan': (setup_clean, run_filter_scan),
+    'treemap': (setup_filter_index, run_treemap),
+    'charts': (setup_charts, run_charts),
+}
+
+# Untimed per-repeat resets for stages whose runs would otherwise warm each other
+RESETS = {
+    'load_cold': reset_load_cold,
+}
+
+
+# ============================================================================
+# MEASUREMENT
+# ============================================================================
+def peak_rss_bytes():
+    """Peak resident set size of this process so far"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def measure(stage, path, rows, repeat):
+    """Set up and time one stage; runs inside a fresh worker process"""
+    setup, run = STAGES[stage]
+    timings = []
+    with tempfile.TemporaryDirectory(prefix="uidai_bench_") as workdir:
+        context = setup(path, Path(workdir))
+        rss_before = peak_rss_bytes()
+
+        for _ in range(repeat):
+            if stage in RESETS:
+                RESETS[stage](context)
+            start = time.perf_counter()
+            # Stages may report extra metrics, e.g. figure payload size
+            extra = run(context) or {}
+            timings.append(time.perf_counter() - start)
+
+    wall = statistics.median(timings)
+    peak = peak_rss_bytes()
+    return {
+        'stage': stage,
+        'rows': rows,
+        'wall_seconds': wall,
+        'wall_seconds_min': min(timings),
+        'repeat': repeat,
+        'peak_rss_bytes': peak,
+        'stage_rss_bytes': max(0, peak - rss_before),
+        'rows_per_second': rows / wall if wall > 0 else None,
+        **extra,
+    }
+
+
+def synthetic_path(rows, seed=0):
+    """Synthetic CSV for `rows`, generated once and reused across runs"""
+    path = DATA_DIR / f"synthetic_{rows}_{seed}.csv"
+    if not path.exists():
+        print(f"   ⚙ Generating {rows:,} synthetic rows...")
+        write_master_data_csv(path, rows, seed=seed)
+    return path
+
+
+def run_suite(stages, sizes, repeat):
+    results = []
+    context = get_context('spawn')
+    for rows in sizes:
+        path = synthetic_path(rows)
+        for stage in stages:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                result = executor.submit(measure, stage, path, rows, repeat).result()
+            results.append(result)
+            print(f"   ✓ {stage:<12} {rows:>12,} rows  {result['wall_seconds']:>9.3f} s  "
+                  f"{result['peak_rss_bytes'] / 1024 ** 2:>8.1f} MB peak  "
+                  f"{result['rows_per_second'] or 0:>14,.0f} rows/s")
+    return results
+
+
+# ============================================================================
+# BASELINES
+# ============================================================================
+def environment():
+    return {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def save_results(results, path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        'created_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'environment': environment(),
+        'results': results,
+    }
+    path.write_text(json.dumps(data, indent=4))
+    return path
+
+
+def find_regressions(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """(stage, rows, metric, baseline, current) for every metric past tolerance"""
+    reference = {(r['stage'], r['rows']): r for r in baseline['results']}
+    regressions = []
+    for result in results:
+        before = reference.get((result['stage'], result['rows']))
+        if before is None:
+            continue
+        for metric, floor in [('wall_seconds', MIN_WALL_DELTA), ('peak_rss_bytes', MIN_RSS_DELTA)]:
+            old, new = before[metric], result[metric]
+            if new > old * (1 + tolerance) and new - old > floor:
+                regressions.append((result['stage'], result['rows'], metric, old, new))
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the UIDAI Pulse hot paths")
+    parser.add_argument('--sizes', nargs='+', type=float, default=DEFAULT_SIZES,
+                        help="row counts, e.g. 1e3 1e5 1e7")
+    parser.add_argument('--stages', nargs='+', choices=list(STAGES), default=list(STAGES))
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per stage (median is kept)")
+    parser.add_argument('--output', type=Path, help="results JSON (default: timestamped in artifacts/benchmarks)")
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH, help="baseline JSON to compare against")
+    parser.add_argument('--save-baseline', action='store_true', help="store this run as the baseline")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed relative slowdown before flagging (0.25 = 25%%)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    sizes = [int(size) for size in args.sizes]
+
+    print("🚀 Running UIDAI Pulse benchmarks")
+    print(f"   Stages: {', '.join(args.stages)} | Sizes: {', '.join(f'{s:,}' for s in sizes)}")
+    print("=" * 60)
+    results = run_suite(args.stages, sizes, args.repeat)
+
+    output = args.output or BENCHMARK_DIR / f"run_{datetime.now():%Y%m%d_%H%M%S}.json"
+    print(f"\n💾 Results saved to: {save_results(results, output)}")
+
+    if args.save_baseline:
+        print(f"💾 Baseline saved to: {save_results(results, args.baseline)}")
+        return 0
+
+    if not args.baseline.exists():
+        print("ℹ No baseline found; rerun with --save-baseline to store one")
+        return 0
+
+    regressions = find_regressions(results, json.loads(args.baseline.read_text()), args.tolerance)
+    if not regressions:
+        print(f"✅ No regressions against {args.baseline}")
+        return 0
+
+    print(f"⚠ {len(regressions)} regression(s) against {args.baseline}:")
+    for stage, rows, metric, old, new in regressions:
+        print(f"   • {stage} @ {rows:,} rows: {metric} {old:,.3f} → {new:,.3f} ({new / old - 1:+.0%})")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+UIDAI Pulse Quantile Sketch Validation
+Compares sketch quantiles against exact quantiles and checks the rank-error bound.
+
+Usage: python scripts/validate_quantile_sketches.py [eps] [synthetic_rows]
+"""
+
+import sys
+import numpy as np
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.artifacts import read_master_data
+from src.cleaning import PERCENT_METRICS
+from src.sketches import DEFAULT_EPS, QuantileSketch
+
+DATA_PATH = Path(__file__).resolve().parent.parent / "artifacts" / "final_master_data.csv"
+
+QUANTILES = [0.25, 0.5, 0.75]
+
+
+def rank_error(sorted_values, estimate, q):
+    """Normalized distance between the estimate's rank interval and q"""
+    n = len(sorted_values)
+    lo = np.searchsorted(sorted_values, estimate, side='left') / n
+    hi = np.searchsorted(sorted_values, estimate, side='right') / n
+    return max(0.0, lo - q, q - hi)
+
+
+def validate_column(name, values, eps):
+    """Print per-quantile errors for one column; returns True if within eps"""
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    sorted_values = np.sort(values)
+    sketch = QuantileSketch.for_error(eps, n_hint=max(len(values), 2)).update(values)
+
+    ok = True
+    for q in QUANTILES:
+        exact = float(np.quantile(sorted_values, q))
+        estimate = sketch.quantile(q)
+        error = rank_error(sorted_values, estimate, q)
+        ok &= error <= eps
+        print(f"   {name:<22} q={q:<4} exact={exact:>10.3f} sketch={estimate:>10.3f} "
+              f"|Δ|={abs(estimate - exact):>8.4f} rank_err={error:.5f}")
+
+    print(f"   {name:<22} n={len(values):,} stored={len(sketch):,} "
+          f"bound={sketch.rank_error_bound:.5f} {'✓' if ok else '⚠'}")
+    return ok
+
+
+def synthetic_columns(df, rows, seed=0):
+    """Resample the real metrics (with jitter) up to `rows` rows"""
+    rng = np.random.default_rng(seed)
+    for col in PERCENT_METRICS:
+        if col in df.columns:
+            base = df[col].dropna().to_numpy(dtype=float)
+            sample = rng.choice(base, size=rows) + rng.normal(0, 0.5, size=rows)
+            yield col, np.clip(sample, 0, 100)
+
+
+def main():
+    eps = float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_EPS
+    rows = int(float(sys.argv[2])) if len(sys.argv) > 2 else 1_000_000
+
+    print(f"🔍 Validating quantile sketches (eps={eps})")
+    df = read_master_data(DATA_PATH)
+    ok = True
+
+    print(f"\n📊 Sample artifact ({len(df):,} rows)")
+    for col in PERCENT_METRICS:
+        if col in df.columns:
+            ok &= validate_column(col, df[col], eps)
+
+    print(f"\n📊 Synthetic resample ({rows:,} rows)")
+    for col, values in synthetic_columns(df, rows):
+        ok &= validate_column(col, values, eps)
+
+    print("\n" + ("✅ All quantiles within the error target" if ok
+                  else "⚠ Rank error exceeded the target"))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,3 @@
+"""
+UIDAI Pulse data utilities
+"""
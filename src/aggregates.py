@@ -0,0 +1,93 @@
+"""
+Dashboard Aggregates for UIDAI Pulse
+Small, cacheable summaries behind the KPI cards and tab views
+"""
+
+import pandas as pd
+import numpy as np
+
+
+CRITICAL_RISK = 70
+HIGH_MIGRATION = 70
+
+# Migration_Intensity is clipped to 0-100, so fixed 5-point bins cover it
+HISTOGRAM_BINS = 20
+HISTOGRAM_RANGE = (0, 100)
+
+
+def kpi_summary(df):
+    """Headline numbers for the KPI cards and the user dashboard"""
+    return {
+        'districts': len(df),
+        'avg_risk': float(df['Risk_Score'].mean()),
+        'critical_districts': int((df['Risk_Score'] > CRITICAL_RISK).sum()),
+        'total_enrolment': float(df['Total_Enrolment'].sum()),
+        'avg_migration': float(df['Migration_Intensity'].mean()),
+        'high_migration': int((df['Migration_Intensity'] > HIGH_MIGRATION).sum()),
+    }
+
+
+def state_digital_summary(df):
+    """Per-state digital penetration, mobile linkage and district count, lowest first"""
+    state_digital = df.groupby('State', observed=True).agg({
+        'Digital_Penetration': 'mean',
+        'Mobile_Linkage_Rate': 'mean',
+        'District': 'count'
+    }).reset_index()
+    state_digital.columns = ['State', 'Avg_Digital_Penetration', 'Avg_Mobile_Linkage', 'District_Count']
+    return state_digital.sort_values('Avg_Digital_Penetration')
+
+
+def migration_histogram(df, bins=HISTOGRAM_BINS, value_range=HISTOGRAM_RANGE):
+    """Binned Migration_Intensity counts (bin midpoint, bin width, district count)"""
+    values = df['Migration_Intensity'].to_numpy(dtype=float)
+    counts, edges = np.histogram(values[~np.isnan(values)], bins=bins, range=value_range)
+    return pd.DataFrame({
+        'Migration_Intensity': (edges[:-1] + edges[1:]) / 2,
+        'Bin_Width': np.diff(edges),
+        'Districts': counts,
+    })
+
+
+# Most leaves a treemap is given; smaller districts are merged into 'Other'
+TREEMAP_NODE_BUDGET = 150
+
+
+def _weighted_migration(nodes):
+    nodes['Migration_Intensity'] = nodes['Weighted_Migration'] / nodes['Total_Enrolment'].replace(0, np.nan)
+    return nodes
+
+
+def treemap_nodes(df, state=None, budget=TREEMAP_NODE_BUDGET):
+    """Aggregated treemap leaves and their path, with at most `budget` leaves
+
+    All India shows one leaf per district while they fit the budget and
+    one per state beyond that. A single state shows its largest districts
+    by enrolment; the rest are merged into an 'Other (n districts)' leaf.
+    Colours are enrolment-weighted migration, as Plotly uses for parents.
+    """
+    nodes = pd.DataFrame({
+        'Total_Enrolment': df['Total_Enrolment'].astype(float),
+        'Weighted_Migration': df['Migration_Intensity'].astype(float) * df['Total_Enrolment'],
+        'Districts': 1,
+    }).groupby([df['State'], df['District']], observed=True).sum().reset_index()
+
+    if len(nodes) > budget and state is None:
+        nodes = nodes.groupby('State', observed=True)[['Total_Enrolment', 'Weighted_Migration', 'Districts']].sum()
+        nodes = _weighted_migration(nodes.reset_index())
+        return nodes[['State', 'Total_Enrolment', 'Migration_Intensity', 'Districts']], ['State']
+
+    if len(nodes) > budget:
+        nodes = nodes.sort_values('Total_Enrolment', ascending=False)
+        kept, rest = nodes.iloc[:budget - 1], nodes.iloc[budget - 1:]
+        other = pd.DataFrame({
+            'State': [state],
+            'District': [f"Other ({len(rest):,} districts)"],
+            'Total_Enrolment': [rest['Total_Enrolment'].sum()],
+            'Weighted_Migration': [rest['Weighted_Migration'].sum()],
+            'Districts': [rest['Districts'].sum()],
+        })
+        nodes = pd.concat([kept.astype({'State': str, 'District': str}), other], ignore_index=True)
+
+    nodes = _weighted_migration(nodes)
+    return nodes[['State', 'District', 'Total_Enrolment', 'Migration_Intensity', 'Districts']], ['State', 'District']
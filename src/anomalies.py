@@ -0,0 +1,115 @@
+"""
+Anomaly Detection for UIDAI Pulse
+Vectorised IQR detector returning a compact long-format result
+"""
+
+import pandas as pd
+import numpy as np
+
+from .sketches import DEFAULT_EPS, sketch_quantiles
+
+
+ANOMALY_COLUMNS = ['Row_Id', 'Metric', 'Deviation']
+
+# Input file of each row when several are combined; Row_Id is then per file
+SOURCE_COLUMN = 'Source'
+
+
+def _sketch_quartiles(values, eps):
+    """(q1, q3) arrays per column of an (n, m) array via quantile sketches"""
+    quartiles = np.array([sketch_quantiles(values[:, j], [0.25, 0.75], eps) for j in range(values.shape[1])])
+    return quartiles[:, 0], quartiles[:, 1]
+
+
+def iqr_bounds(df, metrics, k=3.0, by=None, approximate=False, eps=DEFAULT_EPS):
+    """IQR bounds for every metric from a single quantile call
+
+    Returns (lower, upper) arrays of shape (m,) or, with `by`, arrays of
+    shape (n_rows, m) holding each row's group bounds. With `approximate`
+    the quartiles come from streaming sketches (rank error ≤ `eps`)
+    instead of exact sorts.
+    """
+    metrics = list(metrics)
+
+    if by is None:
+        if approximate:
+            q1, q3 = _sketch_quartiles(df[metrics].to_numpy(dtype=float), eps)
+        else:
+            q1, q3 = df[metrics].quantile([0.25, 0.75]).to_numpy(dtype=float)
+        iqr = q3 - q1
+        return q1 - k * iqr, q3 + k * iqr
+
+    codes, uniques = pd.factorize(df[by])
+    if approximate:
+        values = df[metrics].to_numpy(dtype=float)
+        q1 = np.full((len(uniques), len(metrics)), np.nan)
+        q3 = np.full((len(uniques), len(metrics)), np.nan)
+        for code, positions in pd.Series(codes).groupby(codes).indices.items():
+            if code >= 0:
+                q1[code], q3[code] = _sketch_quartiles(values[positions], eps)
+    else:
+        quantiles = df[metrics].groupby(codes).quantile([0.25, 0.75])
+        q1 = quantiles.xs(0.25, level=1).reindex(range(len(uniques))).to_numpy(dtype=float)
+        q3 = quantiles.xs(0.75, level=1).reindex(range(len(uniques))).to_numpy(dtype=float)
+    iqr = q3 - q1
+
+    # Rows with a missing group (code -1) pick up the trailing NaN row
+    nan_row = np.full((1, len(metrics)), np.nan)
+    lower = np.vstack([q1 - k * iqr, nan_row])
+    upper = np.vstack([q3 + k * iqr, nan_row])
+    return lower[codes], upper[codes]
+
+
+def bounds_from_quartiles(q1, q3, k=3.0):
+    """(metrics, lower, upper) from {metric: quartile} mappings, e.g. sketch output"""
+    metrics = list(q1)
+    q1 = np.array([q1[col] for col in metrics], dtype=float)
+    q3 = np.array([q3[col] for col in metrics], dtype=float)
+    iqr = q3 - q1
+    return metrics, q1 - k * iqr, q3 + k * iqr
+
+
+def flag_anomalies(values, lower, upper, row_ids, metrics):
+    """Long-format (Row_Id, Metric, Deviation) rows for values outside bounds
+
+    `values` is an (n, m) array; Deviation is the signed distance past the
+    violated bound (negative below the lower bound, positive above the upper).
+    """
+    metrics = list(metrics)
+    below = values < lower
+    above = values > upper
+
+    rows, cols = np.nonzero(below | above)
+    values = values[rows, cols]
+    lower = np.broadcast_to(lower, below.shape)[rows, cols]
+    upper = np.broadcast_to(upper, below.shape)[rows, cols]
+
+    return pd.DataFrame({
+        'Row_Id': np.asarray(row_ids)[rows],
+        'Metric': pd.Categorical.from_codes(cols, categories=metrics),
+        'Deviation': np.where(values > upper, values - upper, values - lower),
+    })
+
+
+def detect_iqr_anomalies(df, metrics, k=3.0, by=None, approximate=False, eps=DEFAULT_EPS):
+    """Flag values more than `k` IQRs outside the quartiles, in one pass
+
+    Row_Id is the DataFrame index label, so `df.loc[result['Row_Id']]`
+    recovers the full rows. With `by` (e.g. 'State') bounds are computed
+    per group and the group is included in the result. A `Source` column
+    in `df` is carried over, identifying rows as (Source, Row_Id).
+    """
+    extra = ([by] if by else []) + ([SOURCE_COLUMN] if SOURCE_COLUMN in df.columns else [])
+    metrics = [col for col in metrics if col in df.columns]
+    if not metrics or len(df) == 0:
+        return pd.DataFrame(columns=ANOMALY_COLUMNS + extra)
+
+    lower, upper = iqr_bounds(df, metrics, k, by, approximate, eps)
+    values = df[metrics].to_numpy(dtype=float)
+    result = flag_anomalies(values, lower, upper, np.arange(len(df)), metrics)
+
+    positions = result['Row_Id'].to_numpy()
+    for col in extra:
+        result[col] = df[col].to_numpy()[positions]
+    result['Row_Id'] = df.index.to_numpy()[positions]
+    return result
@@ -0,0 +1,102 @@
+"""
+Artifact I/O for UIDAI Pulse
+Columnar (Parquet) artifacts written alongside CSV, with CSV fallback
+"""
+
+import pandas as pd
+from pathlib import Path
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+RISK_CATEGORIES = ['Low', 'Medium', 'High', 'Critical']
+
+
+def columnar_path(path):
+    """Return the Parquet sibling of a CSV artifact path"""
+    return Path(path).with_suffix('.parquet')
+
+
+def find_columnar(path):
+    """Return the columnar artifact for `path` if it is usable, else None
+
+    The Parquet file is ignored when pyarrow is missing or when the CSV
+    has been replaced after the Parquet file was written.
+    """
+    path = Path(path)
+    if path.suffix == '.parquet':
+        return path if HAS_PYARROW and path.exists() else None
+
+    parquet = columnar_path(path)
+    if not HAS_PYARROW or not parquet.exists():
+        return None
+    if path.exists() and path.stat().st_mtime > parquet.stat().st_mtime:
+        return None
+    return parquet
+
+
+def _restore_dtypes(df):
+    """Re-apply dtypes that CSV text cannot carry"""
+    if 'Risk_Category' in df.columns and not isinstance(df['Risk_Category'].dtype, pd.CategoricalDtype):
+        df['Risk_Category'] = pd.Categorical(df['Risk_Category'], categories=RISK_CATEGORIES, ordered=True)
+    return df
+
+
+def read_master_data(path, columns=None):
+    """Load a master data artifact, preferring the columnar copy
+
+    `columns` projects the read to the listed columns; names missing from
+    the artifact are skipped rather than raising.
+    """
+    path = Path(path)
+    parquet = find_columnar(path)
+
+    if parquet is not None:
+        if columns is not None:
+            import pyarrow.parquet as pq
+            available = set(pq.read_schema(parquet).names)
+            columns = [col for col in columns if col in available]
+        df = pd.read_parquet(parquet, columns=columns)
+    else:
+        usecols = None
+        if columns is not None:
+            wanted = set(columns)
+            usecols = lambda col: col in wanted
+        df = pd.read_csv(path, usecols=usecols)
+
+    return _restore_dtypes(df)
+
+
+def write_columnar(df, path):
+    """Write `df` as the Parquet sibling of `path`; returns the path or None"""
+    if not HAS_PYARROW:
+        return None
+
+    parquet = columnar_path(path)
+    parquet.parent.mkdir(parents=True, exist_ok=True)
+    df.to_parquet(parquet, index=False)
+    return parquet
+
+
+def write_master_data(df, path):
+    """Write a master data artifact as CSV plus its columnar copy"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    df.to_csv(path, index=False)
+    # Written second so its mtime marks it as current for find_columnar
+    return write_columnar(df, path)
+
+
+if __name__ == "__main__":
+    import sys
+
+    for csv_file in sys.argv[1:] or ["artifacts/final_master_data.csv"]:
+        parquet = write_columnar(pd.read_csv(csv_file), csv_file)
+        if parquet is None:
+            print("⚠️  pyarrow is not installed; columnar artifacts are disabled")
+            break
+        print(f"✓ Wrote columnar artifact {parquet}")
@@ -0,0 +1,106 @@
+"""
+Disk Cache Utilities for UIDAI Pulse
+Content hashing, atomic writes, cross-process locking and LRU eviction
+"""
+
+import hashlib
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: atomic renames still keep readers consistent
+    fcntl = None
+
+
+_hash_memo = {}
+
+
+def file_content_hash(path, block_size=1 << 20):
+    """SHA-256 of a file's bytes, read in blocks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_fingerprint(path):
+    """Cheap (path, size, mtime_ns, inode) identity of a file"""
+    stat = os.stat(path)
+    return (str(Path(path).resolve()), stat.st_size, stat.st_mtime_ns, stat.st_ino)
+
+
+def cached_content_hash(path):
+    """Content hash of `path`, recomputed only when its fingerprint changes"""
+    fingerprint = file_fingerprint(path)
+    digest = _hash_memo.get(fingerprint)
+    if digest is None:
+        digest = file_content_hash(path)
+        _hash_memo[fingerprint] = digest
+    return digest
+
+
+@contextmanager
+def atomic_path(path):
+    """Yield a temporary path that replaces `path` atomically on success"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        yield Path(tmp)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+@contextmanager
+def file_lock(path):
+    """Exclusive cross-process lock held on `path` for the block"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'a') as handle:
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def touch(path):
+    """Mark a cache file as recently used"""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def evict_lru(cache_dir, pattern, max_entries):
+    """Keep the `max_entries` most recently used entries matching `pattern`
+
+    An entry is every file sharing a stem with a match (data + report).
+    Recency is the mtime of the matched file, refreshed by `touch`.
+    Returns the evicted stems.
+    """
+    cache_dir = Path(cache_dir)
+    entries = sorted(
+        cache_dir.glob(pattern),
+        key=lambda p: p.stat().st_mtime,
+        reverse=True
+    )
+
+    evicted = []
+    for entry in entries[max_entries:]:
+        for member in cache_dir.glob(f"{entry.stem}.*"):
+            try:
+                member.unlink()
+            except OSError:
+                pass
+        evicted.append(entry.stem)
+    return evicted
@@ -0,0 +1,250 @@
+"""
+Shared Cleaning Engine for UIDAI Pulse
+One vectorised cleaning pass used by the dashboard, the pipeline and the report
+"""
+
+import json
+import pandas as pd
+import numpy as np
+from datetime import datetime
+from pathlib import Path
+
+from .artifacts import HAS_PYARROW, RISK_CATEGORIES, columnar_path, find_columnar, read_master_data
+from .schema import compact_dtypes
+from .sketches import DEFAULT_EPS, sketch_quantiles
+from .cache import atomic_path, cached_content_hash, evict_lru, file_fingerprint, file_lock, touch
+
+
+# Bump whenever a cleaning rule changes so cached artifacts are rebuilt
+CLEANING_VERSION = 3
+
+# Stored cleaned frames keep each row's position in its source file here
+SOURCE_ROW_COLUMN = 'Source_Row'
+
+GHOST_THRESHOLD = 100
+PERCENT_METRICS = ['Migration_Intensity', 'Biometric_Lag', 'Digital_Penetration']
+RISK_BINS = [0, 30, 50, 70, 100]
+
+# Processed versions kept on disk before least-recently-used eviction
+MAX_CACHE_ENTRIES = 4
+
+
+# ============================================================================
+# CLEANING STAGES
+# ============================================================================
+def normalize_names(df):
+    """Upper-case states and title-case districts"""
+    if 'State' in df.columns:
+        df['State'] = df['State'].astype(str).str.strip().str.upper()
+    if 'District' in df.columns:
+        df['District'] = df['District'].astype(str).str.strip().str.title()
+    return df
+
+
+def remove_ghost_districts(df, threshold=GHOST_THRESHOLD):
+    """Drop rows with enrolment at or below `threshold`; returns (df, removed)"""
+    if 'Total_Enrolment' not in df.columns:
+        return df, 0
+
+    kept = df[df['Total_Enrolment'] > threshold].copy()
+    return kept, len(df) - len(kept)
+
+
+def clip_metrics(df, columns=None):
+    """Cap percentage metrics to the 0-100 range"""
+    for col in columns or PERCENT_METRICS:
+        if col in df.columns:
+            df[col] = df[col].clip(0, 100)
+    return df
+
+
+def compute_fill_values(df, strategy='median', approximate=False, eps=DEFAULT_EPS):
+    """Per-column fill values for the numeric columns of `df`
+
+    With `approximate`, medians come from streaming quantile sketches
+    whose normalized rank error is at most `eps` instead of full sorts.
+    """
+    numeric = df.select_dtypes(include=[np.number])
+    if strategy == 'median' and approximate:
+        return pd.Series(
+            {col: sketch_quantiles(numeric[col], [0.5], eps)[0] for col in numeric.columns},
+            dtype=float
+        )
+    if strategy == 'median':
+        return numeric.median()
+    if strategy == 'mean':
+        return numeric.mean()
+    if strategy == 'zero':
+        return pd.Series(0, index=numeric.columns)
+    raise ValueError(f"Unknown fill strategy: {strategy}")
+
+
+def fill_missing(df, fill_values):
+    """Fill missing numeric values from a {column: value} mapping"""
+    numeric_cols = df.select_dtypes(include=[np.number]).columns
+    values = {col: fill_values[col] for col in numeric_cols if col in fill_values}
+    if values:
+        df = df.fillna(value=values)
+    return df
+
+
+def add_risk_scores(df):
+    """Add Risk_Score = Migration × Biometric_Lag / 100 and its category"""
+    if 'Migration_Intensity' in df.columns and 'Biometric_Lag' in df.columns:
+        df['Risk_Score'] = (df['Migration_Intensity'] * df['Biometric_Lag']) / 100
+
+    if 'Risk_Score' in df.columns:
+        df['Risk_Category'] = pd.cut(
+            df['Risk_Score'],
+            bins=RISK_BINS,
+            labels=RISK_CATEGORIES,
+            include_lowest=True
+        )
+    return df
+
+
+def clean_rows(df, ghost_threshold=GHOST_THRESHOLD):
+    """Row-local cleaning stages; safe to run per partition. Returns (df, removed)"""
+    df = normalize_names(df.copy())
+    df, removed = remove_ghost_districts(df, ghost_threshold)
+    df = clip_metrics(df)
+    return df, removed
+
+
+def finalize_clean(df, fill_strategy='median', compact=True):
+    """Global cleaning stages over the full frame; returns (df, memory_stats)
+
+    With `compact` the result is downcast to the memory-compact schema
+    after all derived columns are computed at full precision.
+    """
+    df = fill_missing(df, compute_fill_values(df, fill_strategy))
+    df = add_risk_scores(df)
+
+    memory = {}
+    if compact:
+        df, memory = compact_dtypes(df)
+    return df, memory
+
+
+def clean_master_data(df, fill_strategy='median', ghost_threshold=GHOST_THRESHOLD, compact=True):
+    """Run the full cleaning sequence; returns (clean_df, report)"""
+    rows_in = len(df)
+    df, removed = clean_rows(df, ghost_threshold)
+    df, memory = finalize_clean(df, fill_strategy, compact)
+
+    report = {
+        'cleaning_version': CLEANING_VERSION,
+        'rows_in': rows_in,
+        'rows_out': len(df),
+        'ghost_districts_removed': removed,
+        'fill_strategy': fill_strategy,
+    }
+    report.update(memory)
+    return df, report
+
+
+# ============================================================================
+# CACHED PROCESSED ARTIFACT
+# ============================================================================
+def resolve_source(path):
+    """Return the file that actually backs a master data path"""
+    path = Path(path)
+    return find_columnar(path) or path
+
+
+def processed_artifact_path(content_hash, cache_dir):
+    """Cache path for a source hash at the current cleaning version"""
+    return Path(cache_dir) / f"processed_{content_hash[:16]}_v{CLEANING_VERSION}.csv"
+
+
+def source_fingerprint(path):
+    """Cache key for a master data path: backing file identity + cleaning version
+
+    Cheap enough to compute on every dashboard rerun (one `stat`); it
+    changes whenever the file is replaced. Returns None if it is missing.
+    """
+    source = resolve_source(path)
+    if not source.exists():
+        return None
+    return file_fingerprint(source) + (CLEANING_VERSION,)
+
+
+def write_clean_frame(df, path):
+    """Store cleaned rows (Parquet when available) with their source row numbers"""
+    df = df.assign(**{SOURCE_ROW_COLUMN: df.index})
+    if HAS_PYARROW:
+        with atomic_path(columnar_path(path)) as tmp:
+            df.to_parquet(tmp, index=False)
+    else:
+        with atomic_path(path) as tmp:
+            df.to_csv(tmp, index=False)
+
+
+def read_clean_frame(path, columns=None):
+    """Rows stored by `write_clean_frame`, indexed by their source row again"""
+    if columns is not None:
+        columns = list(columns) + [SOURCE_ROW_COLUMN]
+    df = read_master_data(path, columns=columns).set_index(SOURCE_ROW_COLUMN)
+    df.index.name = None
+    return df
+
+
+def _is_cached(artifact, report_path):
+    return report_path.exists() and (artifact.exists() or find_columnar(artifact) is not None)
+
+
+def _read_cached(artifact, report_path, columns):
+    touch(report_path)
+    report = json.loads(report_path.read_text())
+    df = read_clean_frame(artifact, columns)
+    if find_columnar(artifact) is None:
+        # CSV text carries no dtypes; Parquet keeps the compact schema
+        df, _ = compact_dtypes(df)
+    return df, report
+
+
+def load_processed_data(source_path, columns=None, cache_dir=None, max_entries=MAX_CACHE_ENTRIES):
+    """Load cleaned data for `source_path`, cleaning at most once per content hash
+
+    The cleaned frame is stored as a versioned artifact in `cache_dir`
+    (default: a `cache/` folder next to the source; Parquet when pyarrow
+    is available, CSV otherwise) together with a JSON report. The cache
+    is shared across processes: a file lock lets one worker clean while
+    the others wait and then read its result, files are written
+    atomically, and only the `max_entries` most recently used versions
+    are kept. Returns (df, report).
+    """
+    source = resolve_source(source_path)
+    if not source.exists():
+        raise FileNotFoundError(f"Data file not found: {source_path}")
+
+    if cache_dir is None:
+        cache_dir = Path(source_path).parent / "cache"
+    cache_dir = Path(cache_dir)
+
+    artifact = processed_artifact_path(cached_content_hash(source), cache_dir)
+    report_path = artifact.with_suffix('.json')
+
+    if _is_cached(artifact, report_path):
+        return _read_cached(artifact, report_path, columns)
+
+    with file_lock(cache_dir / ".lock"):
+        # Another worker may have finished the same artifact while we waited
+        if _is_cached(artifact, report_path):
+            return _read_cached(artifact, report_path, columns)
+
+        df, report = clean_master_data(read_master_data(source_path))
+        report['source'] = str(source)
+        report['created_at'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        write_clean_frame(df, artifact)
+
+        # The report is written last and marks the entry as complete
+        with atomic_path(report_path) as tmp:
+            tmp.write_text(json.dumps(report, indent=4))
+
+        evict_lru(cache_dir, "processed_*.json", max_entries)
+
+    if columns is not None:
+        df = df[[col for col in columns if col in df.columns]]
+    return df, report
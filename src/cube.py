@@ -0,0 +1,142 @@
+"""
+State Aggregate Cube for UIDAI Pulse
+Per-state × risk-category × migration-decile sums and counts built once at load time
+"""
+
+import pandas as pd
+import numpy as np
+
+from .aggregates import HIGH_MIGRATION
+from .artifacts import RISK_CATEGORIES
+
+
+CUBE_MEASURES = [
+    'Total_Enrolment', 'Risk_Score', 'Migration_Intensity',
+    'Digital_Penetration', 'Mobile_Linkage_Rate'
+]
+
+# Migration deciles: 10-point bands over the clipped 0-100 range
+DECILE_STEP = 10
+N_DECILES = 100 // DECILE_STEP
+
+# Slot 2i holds values exactly on boundary i*STEP and slot 2i+1 the open
+# band between boundaries i and i+1, so any inclusive range whose ends sit
+# on boundaries is a contiguous run of slots; the last slot is missing values
+N_SLOTS = 2 * N_DECILES + 2
+MISSING_SLOT = N_SLOTS - 1
+
+
+def migration_slots(values):
+    """Cube slot of every Migration_Intensity value"""
+    scaled = np.asarray(values, dtype=float) / DECILE_STEP
+    band = np.floor(scaled)
+    slots = np.where(scaled == band, 2 * band, 2 * band + 1)
+    valid = ~np.isnan(scaled) & (scaled >= 0) & (scaled <= N_DECILES)
+    return np.where(valid, slots, MISSING_SLOT).astype(np.intp)
+
+
+class StateCube:
+    """Constant-size aggregates that answer boundary-aligned dashboard filters
+
+    Cells are indexed by (state, risk category, migration slot) and hold
+    the row count plus, per measure, the sum and non-null count. A filter
+    whose migration range starts and ends on a decile boundary (e.g. the
+    default 0-100) is answered by summing cells, in time independent of
+    the number of districts; `covers` tells callers when to fall back to
+    row-level data instead.
+    """
+
+    def __init__(self, df):
+        codes, uniques = pd.factorize(df['State'], sort=True)
+        self.states = [str(state) for state in uniques]
+
+        categories = pd.Categorical(df['Risk_Category'], categories=RISK_CATEGORIES).codes
+        # Uncategorised rows (missing Risk_Score) get their own category slot
+        categories = np.where(categories < 0, len(RISK_CATEGORIES), categories)
+        slots = migration_slots(df['Migration_Intensity'])
+
+        shape = (len(self.states), len(RISK_CATEGORIES) + 1, N_SLOTS)
+        valid = codes >= 0
+        cells = np.ravel_multi_index((codes[valid], categories[valid], slots[valid]), shape)
+        size = int(np.prod(shape))
+
+        self.shape = shape
+        self.rows = np.bincount(cells, minlength=size).reshape(shape)
+        self.sums = {}
+        self.counts = {}
+        for col in CUBE_MEASURES:
+            values = df[col].to_numpy(dtype=float)[valid]
+            present = ~np.isnan(values)
+            self.sums[col] = np.bincount(cells[present], weights=values[present], minlength=size).reshape(shape)
+            self.counts[col] = np.bincount(cells[present], minlength=size).reshape(shape)
+
+    @staticmethod
+    def covers(low=None, high=None):
+        """True if a migration range can be answered from the cube"""
+        return all(
+            bound is None or (bound % DECILE_STEP == 0 and 0 <= bound <= 100)
+            for bound in (low, high)
+        )
+
+    def _cells(self, state=None, low=None, high=None):
+        """Boolean (state, category, slot) selection for a covered filter"""
+        if not self.covers(low, high):
+            raise ValueError(f"Migration range ({low}, {high}) is not on a {DECILE_STEP}-point boundary")
+
+        selected = np.zeros(self.shape, dtype=bool)
+        states = slice(None) if state is None else [i for i, s in enumerate(self.states) if s == state]
+
+        if low is None and high is None:
+            selected[states] = True
+        else:
+            first = 0 if low is None else 2 * (low // DECILE_STEP)
+            last = 2 * N_DECILES if high is None else 2 * (high // DECILE_STEP)
+            selected[states, :, first:last + 1] = True
+        return selected
+
+    def _slot_range(self, above):
+        """Slots holding values strictly above a boundary-aligned threshold"""
+        return slice(2 * (above // DECILE_STEP) + 1, MISSING_SLOT)
+
+    def kpi_summary(self, state=None, low=None, high=None):
+        """Same result as `aggregates.kpi_summary` on the filtered rows"""
+        selected = self._cells(state, low, high)
+        # Risk bins are right-closed, so 'Critical' is exactly Risk_Score > aggregates.CRITICAL_RISK
+        critical = np.zeros_like(selected)
+        critical[:, RISK_CATEGORIES.index('Critical')] = True
+        high_migration = np.zeros_like(selected)
+        high_migration[:, :, self._slot_range(HIGH_MIGRATION)] = True
+
+        def mean(col):
+            count = self.counts[col][selected].sum()
+            return float(self.sums[col][selected].sum() / count) if count else float('nan')
+
+        return {
+            'districts': int(self.rows[selected].sum()),
+            'avg_risk': mean('Risk_Score'),
+            'critical_districts': int(self.rows[selected & critical].sum()),
+            'total_enrolment': float(self.sums['Total_Enrolment'][selected].sum()),
+            'avg_migration': mean('Migration_Intensity'),
+            'high_migration': int(self.rows[selected & high_migration].sum()),
+        }
+
+    def state_summary(self, state=None, low=None, high=None):
+        """Per-state rows, sums and counts over the selected cells"""
+        selected = self._cells(state, low, high)
+        summary = pd.DataFrame({'State': self.states})
+        summary['Rows'] = np.where(selected, self.rows, 0).sum(axis=(1, 2))
+        for col in CUBE_MEASURES:
+            summary[f'{col}_Sum'] = np.where(selected, self.sums[col], 0).sum(axis=(1, 2))
+            summary[f'{col}_Count'] = np.where(selected, self.counts[col], 0).sum(axis=(1, 2))
+        return summary[summary['Rows'] > 0]
+
+    def state_digital_summary(self, state=None, low=None, high=None):
+        """Same result as `aggregates.state_digital_summary` on the filtered rows"""
+        summary = self.state_summary(state, low, high).reset_index(drop=True)
+        state_digital = pd.DataFrame({
+            'State': summary['State'],
+            'Avg_Digital_Penetration': summary['Digital_Penetration_Sum'] / summary['Digital_Penetration_Count'],
+            'Avg_Mobile_Linkage': summary['Mobile_Linkage_Rate_Sum'] / summary['Mobile_Linkage_Rate_Count'],
+            'District_Count': summary['Rows'],
+        })
+        return state_digital.sort_values('Avg_Digital_Penetration')
@@ -4,46 +4,95 @@ Optional data preparation and transformation functions
 """
 
 import pandas as pd
-import numpy as np
 from scipy.stats.mstats import winsorize
 from pathlib import Path
 
+from .anomalies import ANOMALY_COLUMNS, SOURCE_COLUMN, bounds_from_quartiles, detect_iqr_anomalies, flag_anomalies
+from .artifacts import find_columnar, read_master_data, write_master_data
+from . import cleaning
+from .incremental import DEFAULT_MANIFEST_DIR, incremental_refresh, load_partition
+from .ingestion import ingest_files, resolve_inputs
+from .schema import compact_dtypes, format_bytes
+from .sketches import DEFAULT_EPS
+from .streaming import (
+    iter_chunks, normalize_chunks, remove_ghost_chunks, winsorize_chunks,
+    fill_chunks, risk_score_chunks, QuantileAccumulator, GroupStatsAccumulator
+)
+
+ANOMALY_METRICS = ['Migration_Intensity', 'Biometric_Lag', 'Risk_Score']
+
+STATE_AGGREGATIONS = {
+    'Total_Enrolment': 'sum',
+    'Migration_Intensity': 'mean',
+    'Biometric_Lag': 'mean',
+    'Risk_Score': 'mean'
+}
+
+STATE_STAT_COLUMNS = {
+    'Total_Enrolment': 'State_Total_Enrolment',
+    'Migration_Intensity': 'State_Avg_Migration',
+    'Biometric_Lag': 'State_Avg_Biometric_Lag',
+    'Risk_Score': 'State_Avg_Risk'
+}
+
+def state_stats_path(output_path):
+    """Path of the state-level lookup saved next to a processed artifact"""
+    output_path = Path(output_path)
+    return output_path.with_name(f"{output_path.stem}_state_stats{output_path.suffix}")
+
+
 class UidaiDataPipeline:
     """Data engineering pipeline for UIDAI datasets"""
     
-    def __init__(self, input_path: str):
+    def __init__(self, input_path: str, max_workers: int = None):
+        """`input_path` may be a single file, a directory or a glob pattern
+        such as "data/*_2024-*.csv"; `max_workers` sizes the ingestion pool."""
         self.input_path = Path(input_path)
+        self.input_paths = resolve_inputs(input_path)
+        self.max_workers = max_workers
         self.df = None
+        self.state_stats = None
+        self.ingest_errors = []
+    
+    @property
+    def is_multi_file(self):
+        return len(self.input_paths) > 1 or self.input_paths != [self.input_path]
+        
+    def load_raw_data(self, columns=None):
+        """Load raw data, preferring the columnar artifact over CSV"""
+        if self.is_multi_file:
+            if not self.input_paths:
+                raise FileNotFoundError(f"No data files match: {self.input_path}")
+            self.df = pd.concat(
+                [read_master_data(path, columns=columns) for path in self.input_paths],
+                ignore_index=True
+            )
+            print(f"✓ Loaded {len(self.df)} records from {len(self.input_paths)} files")
+            return self
         
-    def load_raw_data(self):
-        """Load raw data from CSV"""
-        if not self.input_path.exists():
-            raise FileNotFoundError(f"Data file not found: {self.input_path}")
+        source = find_columnar(self.input_path)
+        if source is None:
+            if not self.input_path.exists():
+                raise FileNotFoundError(f"Data file not found: {self.input_path}")
+            source = self.input_path
         
-        self.df = pd.read_csv(self.input_path)
-        print(f"✓ Loaded {len(self.df)} records from {self.input_path.name}")
+        self.df = read_master_data(self.input_path, columns=columns)
+        print(f"✓ Loaded {len(self.df)} records from {source.name}")
         return self
     
     def normalize_names(self):
         """Normalize state and district names"""
-        if 'State' in self.df.columns:
-            self.df['State'] = self.df['State'].astype(str).str.strip().str.upper()
-        
-        if 'District' in self.df.columns:
-            self.df['District'] = self.df['District'].astype(str).str.strip().str.title()
-        
+        self.df = cleaning.normalize_names(self.df)
         print("✓ Normalized state and district names")
         return self
     
-    def remove_ghost_districts(self, threshold=100):
+    def remove_ghost_districts(self, threshold=cleaning.GHOST_THRESHOLD):
         """Remove districts with very low enrolment"""
         if 'Total_Enrolment' not in self.df.columns:
             print("⚠ Total_Enrolment column not found, skipping ghost district removal")
             return self
         
-        initial_count = len(self.df)
-        self.df = self.df[self.df['Total_Enrolment'] > threshold].copy()
-        removed = initial_count - len(self.df)
+        self.df, removed = cleaning.remove_ghost_districts(self.df, threshold)
         
         print(f"✓ Removed {removed} ghost districts (enrolment ≤ {threshold})")
         return self
@@ -51,86 +100,70 @@ class UidaiDataPipeline:
     def winsorize_metrics(self, columns=None, limits=(0, 1)):
         """Apply winsorization to cap outliers"""
         if columns is None:
-            columns = ['Migration_Intensity', 'Biometric_Lag', 'Digital_Penetration']
+            columns = cleaning.PERCENT_METRICS
         
-        for col in columns:
-            if col in self.df.columns:
-                # Clip to 0-100 range for percentage metrics
-                self.df[col] = self.df[col].clip(0, 100)
+        # Clip to 0-100 range for percentage metrics
+        self.df = cleaning.clip_metrics(self.df, columns)
         
         print(f"✓ Winsorized {len(columns)} metric columns")
         return self
     
     def calculate_risk_scores(self):
         """Calculate derived risk metrics"""
-        if 'Migration_Intensity' in self.df.columns and 'Biometric_Lag' in self.df.columns:
-            self.df['Risk_Score'] = (self.df['Migration_Intensity'] * self.df['Biometric_Lag']) / 100
-            print("✓ Calculated risk scores")
+        self.df = cleaning.add_risk_scores(self.df)
         
-        # Add risk categories
         if 'Risk_Score' in self.df.columns:
-            self.df['Risk_Category'] = pd.cut(
-                self.df['Risk_Score'],
-                bins=[0, 30, 50, 70, 100],
-                labels=['Low', 'Medium', 'High', 'Critical']
-            )
+            print("✓ Calculated risk scores")
+        if 'Risk_Category' in self.df.columns:
             print("✓ Added risk categories")
         
         return self
     
-    def add_geospatial_features(self):
-        """Add geospatial aggregations and features"""
-        # State-level statistics
+    def add_geospatial_features(self, broadcast=False):
+        """Add geospatial aggregations and features
+        
+        State-level statistics are kept in `self.state_stats`, a lookup
+        indexed by State. Pass `broadcast=True` to also merge them onto
+        every row (the pre-lookup layout); `get_state_feature` maps a
+        single column on demand instead.
+        """
         if 'State' in self.df.columns:
-            state_stats = self.df.groupby('State').agg({
-                'Total_Enrolment': 'sum',
-                'Migration_Intensity': 'mean',
-                'Biometric_Lag': 'mean',
-                'Risk_Score': 'mean'
-            }).reset_index()
-            
-            state_stats.columns = ['State', 'State_Total_Enrolment', 
-                                   'State_Avg_Migration', 'State_Avg_Biometric_Lag',
-                                   'State_Avg_Risk']
+            state_stats = self.df.groupby('State', observed=True).agg(STATE_AGGREGATIONS)
+            self.state_stats = state_stats.rename(columns=STATE_STAT_COLUMNS)
             
-            self.df = self.df.merge(state_stats, on='State', how='left')
-            print("✓ Added state-level aggregations")
+            if broadcast:
+                self.df = self.df.merge(self.state_stats, left_on='State', right_index=True, how='left')
+            print(f"✓ Added state-level aggregations for {len(self.state_stats)} states")
         
         return self
     
-    def handle_missing_values(self, strategy='median'):
-        """Handle missing values"""
-        numeric_cols = self.df.select_dtypes(include=[np.number]).columns
-        
-        if strategy == 'median':
-            self.df[numeric_cols] = self.df[numeric_cols].fillna(self.df[numeric_cols].median())
-        elif strategy == 'mean':
-            self.df[numeric_cols] = self.df[numeric_cols].fillna(self.df[numeric_cols].mean())
-        elif strategy == 'zero':
-            self.df[numeric_cols] = self.df[numeric_cols].fillna(0)
+    def get_state_feature(self, column):
+        """Per-row view of one state-level statistic, e.g. 'State_Avg_Risk'"""
+        feature = self.df['State'].map(self.state_stats[column])
+        return feature.astype(self.state_stats[column].dtype).rename(column)
+    
+    def handle_missing_values(self, strategy='median', approximate=False, eps=DEFAULT_EPS):
+        """Handle missing values (approximate medians via quantile sketches)"""
+        fill_values = cleaning.compute_fill_values(self.df, strategy, approximate, eps)
+        self.df = cleaning.fill_missing(self.df, fill_values)
         
         print(f"✓ Filled missing values using {strategy} strategy")
         return self
     
-    def detect_anomalies(self):
-        """Detect statistical anomalies using IQR method"""
-        anomalies = pd.DataFrame()
-        
-        for col in ['Migration_Intensity', 'Biometric_Lag', 'Risk_Score']:
-            if col in self.df.columns:
-                Q1 = self.df[col].quantile(0.25)
-                Q3 = self.df[col].quantile(0.75)
-                IQR = Q3 - Q1
-                
-                lower_bound = Q1 - 3 * IQR
-                upper_bound = Q3 + 3 * IQR
-                
-                col_anomalies = self.df[
-                    (self.df[col] < lower_bound) | (self.df[col] > upper_bound)
-                ].copy()
-                col_anomalies['Anomaly_Metric'] = col
-                
-                anomalies = pd.concat([anomalies, col_anomalies])
+    def detect_anomalies(self, by=None, approximate=False, eps=DEFAULT_EPS):
+        """Detect statistical anomalies using IQR method
+        
+        Returns one long-format row per flagged value: Row_Id (row within
+        its Source file), Metric, Deviation past the violated bound and
+        Source, as in streaming and incremental mode. Pass `by='State'` to
+        compute the bounds per state, and `approximate` to take the
+        quartiles from sketches with rank error ≤ `eps`.
+        """
+        anomalies = detect_iqr_anomalies(self.df, ANOMALY_METRICS, by=by,
+                                         approximate=approximate, eps=eps)
+        if SOURCE_COLUMN not in anomalies.columns:
+            # Single input: every row comes from the one file
+            anomalies[SOURCE_COLUMN] = str(self.input_path)
         
         if len(anomalies) > 0:
             print(f"⚠ Detected {len(anomalies)} potential anomalies")
@@ -177,26 +210,67 @@ class UidaiDataPipeline:
         return self
     
     def save_processed_data(self, output_path: str):
-        """Save processed data to CSV"""
+        """Save processed data to CSV and its columnar (Parquet) copy"""
         output_path = Path(output_path)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        self.df.to_csv(output_path, index=False)
+        parquet_path = write_master_data(self.df, output_path)
         print(f"✓ Saved processed data to {output_path}")
+        if parquet_path is not None:
+            print(f"✓ Saved columnar artifact to {parquet_path}")
+        
+        if self.state_stats is not None:
+            stats_path = state_stats_path(output_path)
+            write_master_data(self.state_stats.reset_index(), stats_path)
+            print(f"✓ Saved state-level lookup to {stats_path}")
         
         return self
     
+    def load_cleaned_data(self):
+        """Load data through the shared cleaning engine
+        
+        A single file goes through the content-hash cache; multiple files
+        are parsed and cleaned in parallel by `ingest_files`.
+        """
+        if self.is_multi_file:
+            return self.load_partitions()
+        
+        self.df, report = cleaning.load_processed_data(self.input_path)
+        
+        print(f"✓ Loaded {report['rows_out']} cleaned records "
+              f"(cleaning v{report['cleaning_version']}, source {Path(report['source']).name})")
+        self._print_cleaning_report(report)
+        return self
+    
+    def load_partitions(self):
+        """Ingest every input file in a process pool, isolating per-file errors"""
+        if not self.input_paths:
+            raise FileNotFoundError(f"No data files match: {self.input_path}")
+        
+        self.df, report, self.ingest_errors = ingest_files(self.input_paths, self.max_workers)
+        
+        print(f"✓ Ingested {report['files_ingested']}/{len(self.input_paths)} files "
+              f"({report['rows_out']:,} cleaned records)")
+        for path, message in self.ingest_errors:
+            print(f"⚠ Skipped {path.name}: {message}")
+        self._print_cleaning_report(report)
+        return self
+    
+    def _print_cleaning_report(self, report):
+        print(f"✓ Removed {report['ghost_districts_removed']} ghost districts "
+              f"(enrolment ≤ {cleaning.GHOST_THRESHOLD})")
+        if 'memory_bytes_saved' in report:
+            print(f"✓ Compact dtypes: {format_bytes(report['memory_bytes_before'])} → "
+                  f"{format_bytes(report['memory_bytes_after'])} "
+                  f"(saved {format_bytes(report['memory_bytes_saved'])})")
+    
     def run_full_pipeline(self, output_path: str = None):
         """Execute complete data engineering pipeline"""
         print("\n🚀 Starting UIDAI Data Engineering Pipeline...")
         print("="*60 + "\n")
         
-        self.load_raw_data()
-        self.normalize_names()
-        self.remove_ghost_districts()
-        self.winsorize_metrics()
-        self.handle_missing_values()
-        self.calculate_risk_scores()
+        # Normalization, ghost removal, winsorization, missing values and
+        # risk scores all come from the shared cleaning engine
+        self.load_cleaned_data()
         self.add_geospatial_features()
         
         # Detect anomalies (but don't remove them)
@@ -210,12 +284,165 @@ class UidaiDataPipeline:
         print("✅ Pipeline execution complete!\n")
         
         return self.df, anomalies
+    
+    # ========================================================================
+    # STREAMING MODE
+    # ========================================================================
+    def _iter_raw_chunks(self, chunksize, paths=None):
+        for path in self.input_paths if paths is None else paths:
+            yield from iter_chunks(path, chunksize)
+    
+    def _iter_clean_chunks(self, chunksize, fill_values=None, paths=None):
+        """Generator pipeline over the row-local stages (all inputs, or just `paths`)"""
+        chunks = self._iter_raw_chunks(chunksize, paths)
+        chunks = normalize_chunks(chunks)
+        chunks = remove_ghost_chunks(chunks)
+        chunks = winsorize_chunks(chunks)
+        if fill_values is None:
+            return chunks
+        
+        chunks = fill_chunks(chunks, fill_values)
+        return risk_score_chunks(chunks)
+    
+    def run_streaming_pipeline(self, output_path: str = None, chunksize: int = 100_000, eps=DEFAULT_EPS):
+        """Execute the pipeline chunk by chunk with flat peak memory
+        
+        Row-local stages run as a generator pipeline over CSV or Parquet
+        chunks. The three global stages are fed by one-pass mergeable
+        accumulators (quantile sketches sized for rank error `eps`):
+        
+        1. Median fill values from per-column quantile sketches
+        2. State aggregates and anomaly IQR bounds
+        3. Anomalies flagged and output appended chunk by chunk
+        
+        Returns the state-level aggregates and the detected anomalies.
+        """
+        missing = [path for path in self.input_paths if not path.exists()]
+        if missing or not self.input_paths:
+            raise FileNotFoundError(f"Data file not found: {missing[0] if missing else self.input_path}")
+        
+        print("\n🚀 Starting UIDAI Data Engineering Pipeline (streaming)...")
+        print("="*60 + "\n")
+        
+        # Pass 1: median fill values
+        medians = QuantileAccumulator(eps=eps)
+        total_records = 0
+        for chunk in self._iter_clean_chunks(chunksize):
+            medians.update(chunk)
+            total_records += len(chunk)
+        fill_values = medians.quantile(0.5)
+        print(f"✓ Computed median fill values over {total_records:,} records")
+        
+        # Pass 2: state aggregates and anomaly quantiles
+        state_acc = GroupStatsAccumulator('State', STATE_AGGREGATIONS)
+        quantiles = QuantileAccumulator(ANOMALY_METRICS, eps=eps)
+        for chunk in self._iter_clean_chunks(chunksize, fill_values):
+            state_acc.update(chunk)
+            quantiles.update(chunk)
+        
+        state_stats = state_acc.result().rename(columns=STATE_STAT_COLUMNS).set_index('State')
+        metrics, lower, upper = bounds_from_quartiles(quantiles.quantile(0.25), quantiles.quantile(0.75))
+        print(f"✓ Added state-level aggregations for {len(state_stats)} states")
+        
+        # Pass 3: flag anomalies, write output (state aggregates stay a lookup)
+        if output_path:
+            output_path = Path(output_path)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        anomaly_parts = []
+        first = True
+        for path in self.input_paths:
+            for chunk in self._iter_clean_chunks(chunksize, fill_values, [path]):
+                # Row_Id is the row's position within its Source file (chunk index labels)
+                values = chunk[metrics].to_numpy(dtype=float)
+                flagged = flag_anomalies(values, lower, upper, chunk.index.to_numpy(), metrics)
+                flagged[SOURCE_COLUMN] = str(path)
+                anomaly_parts.append(flagged)
+                
+                if output_path:
+                    chunk.to_csv(output_path, mode='w' if first else 'a', header=first, index=False)
+                first = False
+        
+        anomalies = (pd.concat(anomaly_parts, ignore_index=True) if anomaly_parts
+                     else pd.DataFrame(columns=ANOMALY_COLUMNS + [SOURCE_COLUMN]))
+        if len(anomalies) > 0:
+            print(f"⚠ Detected {len(anomalies)} potential anomalies")
+        else:
+            print("✓ No anomalies detected")
+        
+        if output_path:
+            print(f"✓ Saved processed data to {output_path}")
+            write_master_data(state_stats.reset_index(), state_stats_path(output_path))
+            print(f"✓ Saved state-level lookup to {state_stats_path(output_path)}")
+        
+        print("✅ Streaming pipeline execution complete!\n")
+        
+        return state_stats, anomalies
+    
+    # ========================================================================
+    # INCREMENTAL MODE
+    # ========================================================================
+    def run_incremental_pipeline(self, output_path: str = None, manifest_dir=DEFAULT_MANIFEST_DIR):
+        """Reprocess only the inputs that changed since the last run
+        
+        A partition manifest records each input's content hash with its
+        partial aggregates (state sums/counts, quantile sketches, metric
+        ranges). Only changed inputs are parsed and cleaned; their
+        partials are merged with the stored ones to rebuild the state
+        aggregates and anomaly bounds, and only partitions whose value
+        range crosses a bound are rescanned for anomalies. Writing
+        `output_path` reassembles every stored partition.
+        
+        Returns the state-level aggregates and the detected anomalies.
+        """
+        if not self.input_paths:
+            raise FileNotFoundError(f"No data files match: {self.input_path}")
+        
+        print("\n🚀 Starting UIDAI Data Engineering Pipeline (incremental)...")
+        print("="*60 + "\n")
+        
+        result = incremental_refresh(
+            self.input_paths, 'State', STATE_AGGREGATIONS, ANOMALY_METRICS,
+            manifest_dir=manifest_dir, max_workers=self.max_workers
+        )
+        self.ingest_errors = result['errors']
+        self.state_stats = result['state_stats'].rename(columns=STATE_STAT_COLUMNS)
+        anomalies = result['anomalies']
+        
+        print(f"✓ Reprocessed {result['changed']} changed partitions "
+              f"({result['unchanged']} unchanged, {result['refilled']} re-finalized)")
+        for path, message in self.ingest_errors:
+            print(f"⚠ Skipped {path.name}: {message}")
+        print(f"✓ Merged state-level aggregations for {len(self.state_stats)} states")
+        
+        if len(anomalies) > 0:
+            print(f"⚠ Detected {len(anomalies)} potential anomalies "
+                  f"(scanned {result['scanned']} partitions)")
+        else:
+            print("✓ No anomalies detected")
+        
+        if output_path:
+            manifest = result['manifest']
+            # Same layout as full multi-file mode: per-file row labels plus Source
+            frames = [
+                load_partition(manifest, entry, result['fill_values']).assign(**{SOURCE_COLUMN: entry_key})
+                for entry_key, entry in manifest.entries.items()
+            ]
+            self.df, _ = compact_dtypes(pd.concat(frames))
+            self.save_processed_data(output_path)
+        
+        print("✅ Incremental pipeline execution complete!\n")
+        
+        return self.state_stats, anomalies
 
 
-# Example usage
+# Example usage (run from the project root: python -m src.data_engineering)
 if __name__ == "__main__":
-    # Example: Process the UIDAI dataset
-    pipeline = UidaiDataPipeline("artifacts/final_master_data.csv")
+    import sys
+    
+    # Example: Process the UIDAI dataset (or a directory / glob of partitions)
+    input_path = sys.argv[1] if len(sys.argv) > 1 else "artifacts/final_master_data.csv"
+    pipeline = UidaiDataPipeline(input_path)
     
     try:
         processed_df, anomalies = pipeline.run_full_pipeline(
@@ -0,0 +1,69 @@
+"""
+Large-View Plotting Helpers for UIDAI Pulse
+Stratified scatter sampling and server-side density binning
+"""
+
+import pandas as pd
+import numpy as np
+
+
+# Above this many points the Dual-Risk Matrix switches to large-data mode
+SCATTER_POINT_LIMIT = 20_000
+
+RISK_THRESHOLD = 70
+DENSITY_BINS = 50
+
+
+def risk_quadrants(df, x='Migration_Intensity', y='Biometric_Lag', threshold=RISK_THRESHOLD):
+    """Quadrant code per row: bit 1 = x above threshold, bit 0 = y above (3 = critical)"""
+    return ((df[x].to_numpy() > threshold).astype(np.int8) << 1) | (df[y].to_numpy() > threshold).astype(np.int8)
+
+
+def stratified_sample(strata, budget, keep=None, seed=0):
+    """Row positions of a stratified sample of about `budget` rows
+
+    Rows flagged in `keep` are always included. The remaining budget (at
+    least half of it, so kept rows never crowd out the context) is spread
+    over the other rows in proportion to their stratum sizes, with at
+    least one row per stratum so small groups stay visible. Sampling is
+    seeded, so the same view gives the same points on every rerun.
+    """
+    strata = np.asarray(strata)
+    keep = np.zeros(len(strata), dtype=bool) if keep is None else np.asarray(keep, dtype=bool)
+
+    rest = np.flatnonzero(~keep)
+    room = max(budget - int(keep.sum()), budget // 2)
+    if len(rest) <= room:
+        return np.arange(len(strata))
+
+    codes, _ = pd.factorize(strata[rest])
+    sizes = np.bincount(codes)
+    quota = np.maximum(1, np.floor(sizes * room / len(rest))).astype(np.intp)
+
+    # Random order within each stratum; keep the first `quota` rows of each
+    rng = np.random.default_rng(seed)
+    order = np.lexsort((rng.random(len(rest)), codes))
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    rank = np.arange(len(rest)) - starts[codes[order]]
+    chosen = rest[order[rank < quota[codes[order]]]]
+
+    return np.sort(np.concatenate([np.flatnonzero(keep), chosen]))
+
+
+def scatter_sample(df, budget=SCATTER_POINT_LIMIT, seed=0):
+    """Rows for the Dual-Risk scatter: every critical (>70/>70) row plus a state × quadrant sample"""
+    quadrants = risk_quadrants(df)
+    states, _ = pd.factorize(df['State'])
+    strata = states.astype(np.int64) * 4 + quadrants
+    return df.take(stratified_sample(strata, budget, keep=quadrants == 3, seed=seed))
+
+
+def density_grid(df, x='Migration_Intensity', y='Biometric_Lag', bins=DENSITY_BINS, value_range=(0, 100)):
+    """District counts on a bins × bins grid: (x centres, y centres, counts[y, x])"""
+    xs = df[x].to_numpy(dtype=float)
+    ys = df[y].to_numpy(dtype=float)
+    present = ~(np.isnan(xs) | np.isnan(ys))
+    counts, x_edges, y_edges = np.histogram2d(
+        xs[present], ys[present], bins=bins, range=[value_range, value_range]
+    )
+    return (x_edges[:-1] + x_edges[1:]) / 2, (y_edges[:-1] + y_edges[1:]) / 2, counts.T
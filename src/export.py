@@ -0,0 +1,44 @@
+"""
+Export & Paging Helpers for UIDAI Pulse
+Page slices for large views and chunked CSV export generated on request
+"""
+
+import io
+import math
+
+
+PAGE_SIZES = [10, 25, 50, 100]
+
+# Rows serialised per chunk; bounds the size of any intermediate string
+EXPORT_CHUNK_ROWS = 50_000
+
+
+def page_count(total_rows, page_size):
+    """Number of pages for `total_rows` (at least 1, so an empty view has a page)"""
+    return max(1, math.ceil(total_rows / page_size))
+
+
+def page_slice(df, page, page_size):
+    """Rows of 1-based `page` plus the (first, last) row numbers shown"""
+    page = min(max(1, int(page)), page_count(len(df), page_size))
+    offset = (page - 1) * page_size
+    rows = df.iloc[offset:offset + page_size]
+    return rows, (offset + 1 if len(rows) else 0, offset + len(rows))
+
+
+def iter_csv_text(df, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Yield a frame as CSV text, `chunk_rows` rows at a time (header first)"""
+    if len(df) == 0:
+        yield df.to_csv(index=False)
+        return
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows].to_csv(index=False, header=(start == 0))
+
+
+def export_csv(df, chunk_rows=EXPORT_CHUNK_ROWS):
+    """UTF-8 CSV file object for `df`, written chunk by chunk"""
+    buffer = io.BytesIO()
+    for text in iter_csv_text(df, chunk_rows):
+        buffer.write(text.encode('utf-8'))
+    buffer.seek(0)
+    return buffer
@@ -0,0 +1,62 @@
+"""
+Filter Index for UIDAI Pulse
+Precomputed row positions so dashboard filters are slices, not full-frame scans
+"""
+
+import pandas as pd
+import numpy as np
+
+
+class FilterIndex:
+    """State → row positions plus Migration_Intensity-sorted orders, built once per dataset
+
+    For every state (and for the whole frame) the row positions are kept
+    sorted by the range column, so a (state, low, high) filter is a dict
+    lookup and two `searchsorted` calls. Rows with a missing value sort
+    last and never match a range, as with a boolean mask. The indexed
+    frame is shared, so callers must not modify it in place.
+    """
+
+    def __init__(self, df, key='State', column='Migration_Intensity'):
+        self.df = df
+        self.key = key
+        self.column = column
+
+        values = df[column].to_numpy(dtype=float)
+        codes, uniques = pd.factorize(df[key], sort=True)
+
+        # One stable sort by (state, value); each state's block is a slice
+        order = np.lexsort((values, codes))
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        self.states = [str(state) for state in uniques]
+        self._by_state = {
+            state: (order[start:end], values[order[start:end]])
+            for state, start, end in zip(self.states, bounds[:-1], bounds[1:])
+        }
+
+        everything = np.argsort(values, kind='stable')
+        self._all = (everything, values[everything])
+        self._empty = (np.empty(0, dtype=np.intp), np.empty(0))
+
+    def __len__(self):
+        return len(self.df)
+
+    def positions(self, state=None, low=None, high=None):
+        """Sorted row positions matching `state` (None = all) and low ≤ value ≤ high"""
+        order, values = self._all if state is None else self._by_state.get(state, self._empty)
+
+        if low is not None or high is not None:
+            start = np.searchsorted(values, -np.inf if low is None else low, side='left')
+            end = np.searchsorted(values, np.inf if high is None else high, side='right')
+            order = order[start:end]
+        return np.sort(order)
+
+    def filter(self, state=None, low=None, high=None):
+        """Rows matching the filter, in their original order
+
+        When every row matches, the indexed frame itself is returned (no copy).
+        """
+        positions = self.positions(state, low, high)
+        if len(positions) == len(self.df):
+            return self.df
+        return self.df.take(positions)
@@ -0,0 +1,216 @@
+"""
+Password Hashing for UIDAI Pulse
+Salted KDF hashes calibrated to the host, legacy SHA-256 upgrade and a bounded hashing pool
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .cache import atomic_path
+
+
+# Wall time one hash should take on this host; logins/s ≈ HASH_WORKERS / target
+TARGET_HASH_SECONDS = 0.1
+
+# Cost floors, whatever the calibration measures
+MIN_SCRYPT_N = 2 ** 14
+MIN_PBKDF2_ITERATIONS = 200_000
+SCRYPT_R = 8
+SCRYPT_P = 1
+
+# KDF work runs on at most this many threads (hashlib releases the GIL)
+HASH_WORKERS = min(4, os.cpu_count() or 1)
+
+# Recent successful verifications, so retries in a login burst skip the KDF
+VERIFY_CACHE_SIZE = 1024
+VERIFY_CACHE_TTL_SECONDS = 300
+
+ALGORITHMS = ['scrypt', 'pbkdf2_sha256']
+DEFAULT_ALGORITHM = 'scrypt' if hasattr(hashlib, 'scrypt') else 'pbkdf2_sha256'
+
+# Calibrated once per deployment, so every worker (and restart) hashes alike
+PARAMS_PATH = Path(".password_params.json")
+
+
+def _b64encode(data):
+    return base64.b64encode(data).decode('ascii')
+
+
+def _b64decode(text):
+    return base64.b64decode(text.encode('ascii'))
+
+
+def _scrypt(password, salt, n, r, p):
+    # maxmem must cover 128 * n * r bytes plus slack, or OpenSSL refuses
+    return hashlib.scrypt(password.encode('utf-8'), salt=salt, n=n, r=r, p=p,
+                          maxmem=256 * n * r + (1 << 20), dklen=32)
+
+
+def _pbkdf2(password, salt, iterations):
+    return hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, iterations)
+
+
+def hash_password(password, params):
+    """Encoded hash `algorithm$params...$salt$digest` for `params` (see `calibrate`)"""
+    salt = secrets.token_bytes(16)
+    if params['algorithm'] == 'scrypt':
+        digest = _scrypt(password, salt, params['n'], params['r'], params['p'])
+        fields = [params['n'], params['r'], params['p']]
+    elif params['algorithm'] == 'pbkdf2_sha256':
+        digest = _pbkdf2(password, salt, params['iterations'])
+        fields = [params['iterations']]
+    else:
+        raise ValueError(f"Unknown password algorithm: {params['algorithm']}")
+    return '$'.join([params['algorithm']] + [str(field) for field in fields] + [_b64encode(salt), _b64encode(digest)])
+
+
+def parse_hash(stored):
+    """Parameters of a stored hash; bare 64-hex strings are legacy unsalted SHA-256"""
+    parts = stored.split('$')
+    if parts[0] == 'scrypt' and len(parts) == 6:
+        return {'algorithm': 'scrypt', 'n': int(parts[1]), 'r': int(parts[2]), 'p': int(parts[3])}
+    if parts[0] == 'pbkdf2_sha256' and len(parts) == 4:
+        return {'algorithm': 'pbkdf2_sha256', 'iterations': int(parts[1])}
+    if len(stored) == 64 and all(c in '0123456789abcdef' for c in stored):
+        return {'algorithm': 'sha256'}
+    raise ValueError("Unrecognised password hash format")
+
+
+def check_password(password, stored):
+    """True if `password` matches a stored hash of any supported format"""
+    params = parse_hash(stored)
+    if params['algorithm'] == 'sha256':
+        candidate = hashlib.sha256(password.encode('utf-8')).hexdigest()
+        return hmac.compare_digest(candidate, stored)
+
+    parts = stored.split('$')
+    salt, digest = _b64decode(parts[-2]), _b64decode(parts[-1])
+    if params['algorithm'] == 'scrypt':
+        candidate = _scrypt(password, salt, params['n'], params['r'], params['p'])
+    else:
+        candidate = _pbkdf2(password, salt, params['iterations'])
+    return hmac.compare_digest(candidate, digest)
+
+
+def needs_rehash(stored, params):
+    """True if a stored hash is legacy or weaker than `params`"""
+    current = parse_hash(stored)
+    if current['algorithm'] != params['algorithm']:
+        return True
+    if current['algorithm'] == 'scrypt':
+        return current['n'] < params['n'] or current['r'] < params['r']
+    return current['iterations'] < params['iterations']
+
+
+def calibrate(target_seconds=TARGET_HASH_SECONDS, algorithm=DEFAULT_ALGORITHM):
+    """KDF parameters whose hash takes about `target_seconds` here (never below the floors)
+
+    scrypt doubles N until a hash reaches the target; PBKDF2 scales the
+    iteration count linearly from a timed probe.
+    """
+    salt = secrets.token_bytes(16)
+    if algorithm == 'scrypt':
+        n = MIN_SCRYPT_N
+        while True:
+            start = time.perf_counter()
+            _scrypt('calibration', salt, n, SCRYPT_R, SCRYPT_P)
+            # The next doubling would take about twice as long; stop if that overshoots more
+            if time.perf_counter() - start >= target_seconds / 1.5:
+                break
+            n *= 2
+        return {'algorithm': 'scrypt', 'n': n, 'r': SCRYPT_R, 'p': SCRYPT_P}
+
+    if algorithm == 'pbkdf2_sha256':
+        probe = 50_000
+        start = time.perf_counter()
+        _pbkdf2('calibration', salt, probe)
+        elapsed = max(time.perf_counter() - start, 1e-6)
+        iterations = int(probe * target_seconds / elapsed) // 1000 * 1000
+        return {'algorithm': 'pbkdf2_sha256', 'iterations': max(MIN_PBKDF2_ITERATIONS, iterations)}
+
+    raise ValueError(f"Unknown password algorithm: {algorithm}")
+
+
+def load_params(path=PARAMS_PATH, target_seconds=TARGET_HASH_SECONDS, algorithm=DEFAULT_ALGORITHM,
+                recalibrate=False):
+    """Stored KDF parameters for this deployment, calibrating and saving them on first use"""
+    path = Path(path)
+    if path.exists() and not recalibrate:
+        return json.loads(path.read_text())
+
+    params = calibrate(target_seconds, algorithm)
+    with atomic_path(path) as tmp:
+        tmp.write_text(json.dumps(params, indent=4))
+    print(f"✓ Calibrated {params['algorithm']} password hashing to ~{target_seconds * 1000:.0f} ms: {params}")
+    return params
+
+
+class PasswordHasher:
+    """Hash and verify passwords on a bounded thread pool
+
+    New hashes use `params`; `verify` also reports whether a matching
+    stored hash should be replaced (legacy SHA-256 or weaker parameters).
+    Successful verifications are remembered for a few minutes under a
+    keyed digest of (stored hash, password), so repeated logins during a
+    burst skip the KDF; failures are never cached.
+    """
+
+    def __init__(self, params, workers=HASH_WORKERS,
+                 cache_size=VERIFY_CACHE_SIZE, cache_ttl=VERIFY_CACHE_TTL_SECONDS):
+        self.params = params
+        self.workers = workers
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-kdf')
+        self._cache_key = secrets.token_bytes(32)
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+        self._cache_ttl = cache_ttl
+        self._cache_lock = threading.Lock()
+
+    @classmethod
+    def calibrated(cls, path=PARAMS_PATH, **kwargs):
+        """Hasher with this deployment's calibrated parameters (see `load_params`)"""
+        return cls(load_params(path), **kwargs)
+
+    def hash(self, password):
+        """New encoded hash of `password` (runs on the pool)"""
+        return self._pool.submit(hash_password, password, self.params).result()
+
+    def _cache_entry(self, password, stored):
+        return hmac.new(self._cache_key, f"{stored}\0{password}".encode('utf-8'), hashlib.sha256).digest()
+
+    def verify(self, password, stored):
+        """(matches, needs_rehash) for a password against a stored hash"""
+        entry = self._cache_entry(password, stored)
+        now = time.monotonic()
+        with self._cache_lock:
+            expires = self._cache.get(entry)
+            if expires is not None and expires > now:
+                self._cache.move_to_end(entry)
+                return True, needs_rehash(stored, self.params)
+
+        try:
+            matches = self._pool.submit(check_password, password, stored).result()
+        except ValueError:
+            # Corrupt or unknown stored hash: treat as a failed login
+            return False, False
+        if not matches:
+            return False, False
+
+        with self._cache_lock:
+            self._cache[entry] = now + self._cache_ttl
+            self._cache.move_to_end(entry)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return True, needs_rehash(stored, self.params)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True)
@@ -0,0 +1,146 @@
+"""
+Bulk User Provisioning for UIDAI Pulse
+Read a CSV/JSONL roster, validate it against the store, hash in parallel and commit in one step
+"""
+
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import repeat
+from pathlib import Path
+
+from .passwords import hash_password, parse_hash
+from .user_store import USER_ROLES
+
+
+# Same rule as the Register tab
+MIN_PASSWORD_LENGTH = 6
+
+# Error lines printed before the rest are summarised
+MAX_REPORTED_ERRORS = 20
+
+
+def read_roster(path):
+    """Rows of a .csv (header: username,password,email,role) or .jsonl/.ndjson roster
+
+    A row may give `password_hash` (any format `passwords.parse_hash`
+    accepts) instead of `password`, e.g. when migrating accounts from
+    another system; such rows skip hashing.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix not in ('.csv', '.jsonl', '.ndjson'):
+        raise ValueError(f"Unsupported roster format: {path.suffix} (expected .csv, .jsonl or .ndjson)")
+
+    try:
+        if suffix == '.csv':
+            with open(path, newline='', encoding='utf-8') as f:
+                return [{key.strip(): value for key, value in row.items() if key} for row in csv.DictReader(f)]
+        with open(path, encoding='utf-8') as f:
+            lines = [line for line in f if line.strip()]
+    except OSError as e:
+        raise ValueError(f"Cannot read roster {path}: {e.strerror or e}") from e
+
+    rows = []
+    for line, text in enumerate(lines, start=1):
+        try:
+            rows.append(json.loads(text))
+        except json.JSONDecodeError as e:
+            raise ValueError(f"line {line}: invalid JSON ({e.msg})") from e
+    return rows
+
+
+def validate_roster(rows, existing, default_role='user'):
+    """(valid rows, errors) for a roster checked against itself and the existing usernames
+
+    `existing` is the store's username set; a dict of roster usernames to
+    line numbers catches duplicates inside the file. Errors are
+    (line, message) pairs, with line 1 the first data row.
+    """
+    seen = {}
+    valid, errors = [], []
+    for line, row in enumerate(rows, start=1):
+        if not isinstance(row, dict):
+            # e.g. a JSONL line holding a list or a bare string
+            errors.append((line, f"expected an object with username/password, got {type(row).__name__}"))
+            continue
+        username = str(row.get('username') or '').strip()
+        password = str(row.get('password') or '')
+        password_hash = str(row.get('password_hash') or '').strip() or None
+        role = str(row.get('role') or default_role).strip().lower()
+
+        if not username:
+            errors.append((line, "missing username"))
+        elif username in seen:
+            errors.append((line, f"duplicate username '{username}' (first on line {seen[username]})"))
+        elif username in existing:
+            errors.append((line, f"username '{username}' already exists"))
+        elif password_hash is not None and not _valid_hash(password_hash):
+            errors.append((line, f"unrecognised password_hash for '{username}'"))
+        elif password_hash is None and len(password) < MIN_PASSWORD_LENGTH:
+            errors.append((line, f"password for '{username}' is shorter than {MIN_PASSWORD_LENGTH} characters"))
+        elif role not in USER_ROLES:
+            errors.append((line, f"unknown role '{role}' for '{username}' (expected one of {USER_ROLES})"))
+        else:
+            valid.append({'username': username, 'password': password, 'password_hash': password_hash,
+                          'email': str(row.get('email') or '').strip() or None, 'role': role})
+        if username and username not in seen:
+            seen[username] = line
+    return valid, errors
+
+
+def _valid_hash(password_hash):
+    try:
+        parse_hash(password_hash)
+    except ValueError:
+        return False
+    return True
+
+
+def hash_passwords(passwords, params, workers=None):
+    """Encoded hashes for `passwords`, computed across a process pool"""
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(passwords) < 2:
+        return [hash_password(password, params) for password in passwords]
+    chunksize = max(1, len(passwords) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(hash_password, passwords, repeat(params), chunksize=chunksize))
+
+
+def provision_users(path, store, params, default_role='user', workers=None, dry_run=False):
+    """Create every user in a roster, all or nothing
+
+    Nothing is written unless the whole roster validates. Passwords are
+    hashed in parallel with the deployment's KDF parameters, then the
+    batch goes to `store.add_many` (one SQLite transaction, or one
+    atomic file swap for the JSON store). Returns a summary dict.
+    """
+    rows = read_roster(path)
+    valid, errors = validate_roster(rows, store.usernames(), default_role)
+    summary = {'rows': len(rows), 'valid': len(valid), 'errors': errors, 'created': 0}
+
+    print(f"📋 {path}: {len(rows):,} rows, {len(valid):,} valid, {len(errors):,} rejected")
+    for line, message in errors[:MAX_REPORTED_ERRORS]:
+        print(f"  ⚠ line {line}: {message}")
+    if len(errors) > MAX_REPORTED_ERRORS:
+        print(f"  ⚠ ... and {len(errors) - MAX_REPORTED_ERRORS:,} more")
+    if errors or dry_run or not valid:
+        return summary
+
+    # KDF cost dominates: roughly rows × hash time / workers
+    to_hash = [row for row in valid if row['password_hash'] is None]
+    if to_hash:
+        print(f"🔐 Hashing {len(to_hash):,} passwords on {workers or os.cpu_count() or 1} processes...")
+    hashes = hash_passwords([row['password'] for row in to_hash], params, workers)
+    for row, password_hash in zip(to_hash, hashes):
+        row['password_hash'] = password_hash
+
+    created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    summary['created'] = store.add_many({
+        row['username']: {'password': row['password_hash'], 'email': row['email'],
+                          'role': row['role'], 'created_at': created_at}
+        for row in valid
+    })
+    return summary
@@ -0,0 +1,82 @@
+"""
+Master Data Schema for UIDAI Pulse
+Memory-compact dtypes for the cleaned master DataFrame
+"""
+
+import pandas as pd
+import numpy as np
+
+from .artifacts import RISK_CATEGORIES
+
+
+CATEGORICAL_COLUMNS = ['State', 'District']
+
+FLOAT32_COLUMNS = [
+    'Migration_Intensity', 'Biometric_Lag', 'Digital_Penetration',
+    'Mobile_Linkage_Rate', 'Update_Frequency', 'Risk_Score'
+]
+
+INTEGER_COLUMNS = ['Total_Enrolment']
+
+
+def memory_bytes(df):
+    """Deep memory footprint of a DataFrame in bytes"""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def _smallest_int_dtype(series):
+    """int32 when every value fits, else int64; None if not integral"""
+    if series.isna().any():
+        return None
+    values = series.to_numpy()
+    if not np.issubdtype(values.dtype, np.integer) and not np.array_equal(values, np.round(values)):
+        return None
+    info = np.iinfo(np.int32)
+    if len(values) == 0 or (values.min() >= info.min and values.max() <= info.max):
+        return 'int32'
+    return 'int64'
+
+
+def compact_dtypes(df):
+    """Downcast a copy of `df` to the master schema; returns (df, stats)
+
+    States and districts become categoricals, percentage metrics float32,
+    enrolment int32 (int64 if any value overflows) and Risk_Category an
+    ordered categorical. Values are unchanged apart from float32 rounding.
+    """
+    before = memory_bytes(df)
+    df = df.copy()
+
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+
+    for col in FLOAT32_COLUMNS:
+        if col in df.columns and pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = df[col].astype('float32')
+
+    for col in INTEGER_COLUMNS:
+        if col in df.columns and pd.api.types.is_numeric_dtype(df[col]):
+            dtype = _smallest_int_dtype(df[col])
+            if dtype is not None:
+                df[col] = df[col].astype(dtype)
+
+    if 'Risk_Category' in df.columns:
+        df['Risk_Category'] = pd.Categorical(df['Risk_Category'], categories=RISK_CATEGORIES, ordered=True)
+
+    after = memory_bytes(df)
+    stats = {
+        'memory_bytes_before': before,
+        'memory_bytes_after': after,
+        'memory_bytes_saved': before - after,
+    }
+    return df, stats
+
+
+def format_bytes(num_bytes):
+    """Human-readable byte count"""
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if abs(num_bytes) < 1024:
+            return f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:.1f} TB"
@@ -0,0 +1,143 @@
+"""
+Search Index for UIDAI Pulse
+Trigram / prefix / fuzzy lookup of district and state names, built once per dataset
+"""
+
+import bisect
+
+import pandas as pd
+import numpy as np
+
+
+SEARCH_COLUMNS = ['District', 'State']
+SEARCH_MODES = ['Contains', 'Prefix', 'Fuzzy']
+
+# Minimum trigram similarity (Jaccard) for a fuzzy match
+FUZZY_THRESHOLD = 0.3
+
+
+def _pack(gram):
+    """Integer code of a three-character string (21 bits per code point)"""
+    return (ord(gram[0]) << 42) | (ord(gram[1]) << 21) | ord(gram[2])
+
+
+def _trigram_codes(texts):
+    """(text_id, code) pairs for the padded trigrams of each text, deduplicated
+
+    A trigram is packed into one integer (21 bits per code point), so
+    postings are built with array sorts instead of per-string Python sets.
+    """
+    padded = [f"  {text} " for text in texts]
+    if not padded:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.uint64)
+
+    width = max(len(text) for text in padded)
+    chars = np.array(padded, dtype=f'U{width}').view(np.uint32).reshape(len(padded), width).astype(np.uint64)
+    lengths = np.array([len(text) for text in padded])
+
+    ids, codes = [], []
+    for i in range(width - 2):
+        valid = np.flatnonzero(lengths >= i + 3)
+        ids.append(valid)
+        codes.append((chars[valid, i] << 42) | (chars[valid, i + 1] << 21) | chars[valid, i + 2])
+
+    codes, ids = np.concatenate(codes), np.concatenate(ids)
+    order = np.lexsort((ids, codes))
+    codes, ids = codes[order], ids[order]
+    keep = np.ones(len(codes), dtype=bool)
+    keep[1:] = (codes[1:] != codes[:-1]) | (ids[1:] != ids[:-1])
+    return ids[keep], codes[keep]
+
+
+class SearchIndex:
+    """Lowercased name vocabulary with trigram postings and row positions
+
+    Names are indexed once per unique value, not per row, so lookups cost
+    time in the size of the vocabulary hit rather than the table. Each
+    (column, name) entry maps to the sorted row positions holding it.
+    """
+
+    def __init__(self, df, columns=None):
+        self.columns = [col for col in (columns or SEARCH_COLUMNS) if col in df.columns]
+        self.names = []
+        self.rows = []
+
+        for col in self.columns:
+            codes, uniques = pd.factorize(df[col])
+            order = np.argsort(codes, kind='stable')
+            bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+            for code, name in enumerate(uniques):
+                self.names.append(str(name).lower())
+                self.rows.append(order[bounds[code]:bounds[code + 1]])
+
+        self._names = np.array(self.names, dtype=str)
+
+        # Postings: trigram code → sorted entry ids (pairs come sorted by code)
+        entries, codes = _trigram_codes(self.names)
+        self._gram_counts = np.bincount(entries, minlength=len(self.names))
+        keys, starts = np.unique(codes, return_index=True)
+        self._postings = dict(zip(keys.tolist(), np.split(entries, starts[1:])))
+
+        self._sorted = sorted(range(len(self.names)), key=self.names.__getitem__)
+        self._sorted_names = [self.names[entry] for entry in self._sorted]
+
+    def __len__(self):
+        return len(self.names)
+
+    def _posting(self, code):
+        return self._postings.get(code, np.empty(0, dtype=np.intp))
+
+    def contains(self, query):
+        """Entries whose name contains `query` as a substring"""
+        query = query.strip().lower()
+        if len(query) < 3:
+            # Too short for trigrams; the vocabulary is small enough to scan
+            return np.flatnonzero(np.char.find(self._names, query) >= 0)
+
+        # The query's own (unpadded) trigrams must all occur in the name
+        inner = {_pack(query[i:i + 3]) for i in range(len(query) - 2)}
+        candidates = None
+        for code in sorted(inner, key=lambda c: len(self._posting(c))):
+            posting = self._posting(code)
+            candidates = posting if candidates is None else np.intersect1d(candidates, posting, assume_unique=True)
+            if len(candidates) == 0:
+                break
+        # Trigram hits can be scattered; confirm the substring itself
+        return np.array([entry for entry in candidates if query in self.names[entry]], dtype=np.intp)
+
+    def prefix(self, query):
+        """Entries whose name starts with `query`"""
+        query = query.strip().lower()
+        start = bisect.bisect_left(self._sorted_names, query)
+        end = bisect.bisect_left(self._sorted_names, query + '\uffff')
+        return np.sort(np.array(self._sorted[start:end], dtype=np.intp))
+
+    def fuzzy(self, query, threshold=FUZZY_THRESHOLD):
+        """(entries, scores) with trigram similarity ≥ threshold, best first"""
+        _, codes = _trigram_codes([query.strip().lower()])
+        postings = [self._posting(code) for code in codes.tolist()]
+        if not postings:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+
+        shared = np.bincount(np.concatenate(postings), minlength=len(self.names))
+        scores = shared / (len(codes) + self._gram_counts - shared)
+        entries = np.flatnonzero(scores >= threshold)
+        entries = entries[np.lexsort((self._names[entries], -scores[entries]))]
+        return entries, scores[entries]
+
+    def match(self, query, mode='Contains'):
+        """Matching entries for a search mode (see SEARCH_MODES)"""
+        if mode == 'Prefix':
+            return self.prefix(query)
+        if mode == 'Fuzzy':
+            return self.fuzzy(query)[0]
+        if mode == 'Contains':
+            return self.contains(query)
+        raise ValueError(f"Unknown search mode: {mode}")
+
+    def lookup(self, query, mode='Contains'):
+        """Sorted row positions whose district or state matches `query`"""
+        entries = self.match(query, mode)
+        if len(entries) == 0:
+            return np.empty(0, dtype=np.intp)
+        return np.unique(np.concatenate([self.rows[entry] for entry in entries]))
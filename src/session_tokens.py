@@ -0,0 +1,184 @@
+"""
+Session Tokens for UIDAI Pulse
+Stateless HMAC-signed login tokens with expiry and role claims, plus a shared revocation list
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import threading
+import time
+from pathlib import Path
+
+from .cache import atomic_path, file_fingerprint, file_lock
+
+
+# Signed-in browsers stay signed in for one working shift
+SESSION_TTL_SECONDS = 12 * 60 * 60
+
+# Key shared by every server process: UIDAI_SESSION_SECRET, else a generated key file
+SECRET_ENV = 'UIDAI_SESSION_SECRET'
+SECRET_PATH = Path(".session_secret")
+# A generated key is 64 hex characters; anything shorter is rejected
+MIN_SECRET_LENGTH = 32
+REVOCATION_PATH = Path(".session_revocations")
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+
+def _read_secret(path):
+    """Key bytes from a key file, or None if it is missing or too short to trust"""
+    try:
+        secret = Path(path).read_bytes().strip()
+    except FileNotFoundError:
+        return None
+    return secret if len(secret) >= MIN_SECRET_LENGTH else None
+
+
+def load_secret(path=SECRET_PATH):
+    """Signing key from the environment, or from a key file created on first use
+
+    The key file is written to a temporary file and renamed into place, so
+    readers never see a partial key; an empty or truncated file (e.g. from
+    a crash) is regenerated under a lock rather than used as a weak key.
+    """
+    secret = os.environ.get(SECRET_ENV)
+    if secret:
+        if len(secret) < MIN_SECRET_LENGTH:
+            raise ValueError(f"{SECRET_ENV} must be at least {MIN_SECRET_LENGTH} characters")
+        return secret.encode('utf-8')
+
+    path = Path(path)
+    secret = _read_secret(path)
+    if secret is None:
+        with file_lock(path.with_name(f"{path.name}.lock")):
+            # Another worker may have published the key while we waited
+            secret = _read_secret(path)
+            if secret is None:
+                with atomic_path(path) as tmp:
+                    # mkstemp files are already private (0600)
+                    tmp.write_bytes(secrets.token_hex(32).encode('ascii'))
+                secret = _read_secret(path)
+    return secret
+
+
+class RevocationList:
+    """Revoked token ids, shared by all processes through a small file
+
+    The in-memory index maps token id to expiry and is reloaded only when
+    the file changes, so `is_revoked` is a stat plus a set lookup. Expired
+    entries are dropped when the file is compacted on revoke.
+    """
+
+    def __init__(self, path=REVOCATION_PATH):
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(f"{self.path.name}.lock")
+        self._revoked = {}
+        self._stamp = None
+        self._index_lock = threading.Lock()
+
+    def _read(self):
+        revoked = {}
+        if self.path.exists():
+            for line in self.path.read_text().splitlines():
+                token_id, _, expires = line.partition(' ')
+                if token_id and expires:
+                    revoked[token_id] = float(expires)
+        return revoked
+
+    def _index(self):
+        try:
+            stamp = file_fingerprint(self.path)
+        except FileNotFoundError:
+            stamp = None
+        with self._index_lock:
+            if stamp != self._stamp:
+                self._revoked, self._stamp = self._read(), stamp
+            return self._revoked
+
+    def is_revoked(self, token_id):
+        return token_id in self._index()
+
+    def revoke(self, token_id, expires):
+        """Revoke one token until its expiry"""
+        now = time.time()
+        with file_lock(self.lock_path):
+            revoked = {tid: exp for tid, exp in self._read().items() if exp > now}
+            revoked[token_id] = float(expires)
+            with atomic_path(self.path) as tmp:
+                tmp.write_text(''.join(f"{tid} {exp}\n" for tid, exp in revoked.items()))
+        with self._index_lock:
+            self._stamp = None
+
+    def __len__(self):
+        return len(self._index())
+
+
+class SessionTokens:
+    """Issue and verify `payload.signature` tokens (HMAC-SHA256, URL-safe base64)
+
+    Claims: `sub` (username), `role`, `iat`/`exp` (epoch seconds) and a
+    random `jti` used for revocation. Verification needs only the key and
+    the revocation index - never the user store.
+    """
+
+    def __init__(self, secret, revocations=None, ttl=SESSION_TTL_SECONDS):
+        self.secret = secret
+        self.revocations = revocations if revocations is not None else RevocationList()
+        self.ttl = ttl
+
+    def _sign(self, payload):
+        return _b64encode(hmac.new(self.secret, payload.encode('ascii'), hashlib.sha256).digest())
+
+    def issue(self, username, role, now=None):
+        """Signed token for a freshly authenticated user"""
+        now = time.time() if now is None else now
+        claims = {
+            'sub': username,
+            'role': role,
+            'iat': int(now),
+            'exp': int(now + self.ttl),
+            'jti': secrets.token_urlsafe(12),
+        }
+        payload = _b64encode(json.dumps(claims, separators=(',', ':')).encode('utf-8'))
+        return f"{payload}.{self._sign(payload)}"
+
+    def verify(self, token, now=None):
+        """Claims of a valid, unexpired, unrevoked token, else None"""
+        if not token or token.count('.') != 1:
+            return None
+        payload, signature = token.split('.')
+        try:
+            if not hmac.compare_digest(self._sign(payload), signature):
+                return None
+            claims = json.loads(_b64decode(payload))
+        except (TypeError, ValueError, UnicodeError):
+            return None
+
+        now = time.time() if now is None else now
+        if not isinstance(claims, dict) or claims.get('exp', 0) <= now:
+            return None
+        if self.revocations.is_revoked(claims.get('jti')):
+            return None
+        return claims
+
+    def revoke(self, token):
+        """Revoke a token (e.g. on logout); invalid tokens are ignored"""
+        claims = self.verify(token)
+        if claims is not None:
+            self.revocations.revoke(claims['jti'], claims['exp'])
+        return claims is not None
+
+
+def open_session_tokens(ttl=SESSION_TTL_SECONDS):
+    """Session token service using the shared key and revocation list"""
+    return SessionTokens(load_secret(), RevocationList(), ttl)
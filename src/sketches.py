@@ -0,0 +1,149 @@
+"""
+Quantile Sketches for UIDAI Pulse
+Mergeable approximate quantiles with a configurable rank-error bound
+"""
+
+import math
+import numpy as np
+
+
+# Default normalized rank-error target for approximate mode
+DEFAULT_EPS = 0.01
+
+
+class QuantileSketch:
+    """Mergeable quantile sketch with bounded memory (KLL-style compactors)
+
+    Values are buffered at level 0; whenever a level holds 2*k items it is
+    sorted and every other item (random offset) is promoted to the next
+    level with double weight. Memory stays O(k log(n/k)) for n values.
+    While nothing has been compacted the answers are exact.
+
+    Each compaction at level h moves any rank by at most 2**h, so
+    `rank_error_bound` is a guaranteed bound on the normalized rank error
+    of every answer. `for_error` sizes k for a target bound.
+    """
+
+    # Values are fed in blocks of this size so memory stays fixed
+    BLOCK_SIZE = 1 << 16
+
+    def __init__(self, k=200, seed=0):
+        self.k = k
+        self.n = 0
+        self.levels = [np.empty(0)]
+        self.error_weight = 0
+        self._rng = np.random.default_rng(seed)
+
+    @classmethod
+    def for_error(cls, eps, n_hint=10 ** 8, seed=0):
+        """Sketch whose rank error stays within `eps` for up to `n_hint` values"""
+        return cls(k_for_error(eps, n_hint), seed)
+
+    def update(self, values):
+        """Add an array of values (NaNs are ignored)"""
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+
+        self.n += len(values)
+        for start in range(0, len(values), self.BLOCK_SIZE):
+            self.levels[0] = np.concatenate([self.levels[0], values[start:start + self.BLOCK_SIZE]])
+            self._compress()
+        return self
+
+    def merge(self, other):
+        """Fold another sketch into this one"""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for h, items in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], items])
+        self.n += other.n
+        self.error_weight += other.error_weight
+        self._compress()
+        return self
+
+    def _compress(self):
+        h = 0
+        while h < len(self.levels):
+            items = self.levels[h]
+            if len(items) >= 2 * self.k:
+                items = np.sort(items)
+                # Keep one item back when the count is odd so weights stay exact
+                keep = items[:len(items) % 2]
+                items = items[len(items) % 2:]
+                promoted = items[self._rng.integers(2)::2]
+                self.error_weight += 2 ** h
+
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[h] = keep
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+            h += 1
+
+    @property
+    def is_exact(self):
+        """True while no compaction has happened"""
+        return all(len(items) == 0 for items in self.levels[1:])
+
+    @property
+    def rank_error_bound(self):
+        """Guaranteed bound on the normalized rank error of `quantile`"""
+        return self.error_weight / self.n if self.n else 0.0
+
+    def quantile(self, q):
+        """Estimate the q-th quantile (0 <= q <= 1)"""
+        if self.n == 0:
+            return np.nan
+
+        if self.is_exact:
+            return float(np.quantile(self.levels[0], q))
+
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([
+            np.full(len(items), 2 ** h, dtype=float)
+            for h, items in enumerate(self.levels)
+        ])
+        order = np.argsort(values, kind='mergesort')
+        values = values[order]
+        cumulative = np.cumsum(weights[order])
+        idx = np.searchsorted(cumulative, q * cumulative[-1], side='left')
+        return float(values[min(idx, len(values) - 1)])
+
+    def __len__(self):
+        return sum(len(items) for items in self.levels)
+
+    def to_dict(self):
+        """JSON-serialisable state"""
+        return {
+            'k': self.k,
+            'n': self.n,
+            'error_weight': self.error_weight,
+            'levels': [items.tolist() for items in self.levels],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data['k'])
+        sketch.n = data['n']
+        sketch.error_weight = data.get('error_weight', 0)
+        sketch.levels = [np.asarray(items, dtype=float) for items in data['levels']] or [np.empty(0)]
+        return sketch
+
+
+def k_for_error(eps, n_hint=10 ** 8):
+    """Compactor size k that keeps the rank error bound within `eps`
+
+    The bound grows by about 1/(2k) per level and there are about
+    log2(n/k) levels, so k = log2(n) / (2 * eps) is sufficient.
+    """
+    if not 0 < eps < 1:
+        raise ValueError(f"eps must be in (0, 1), got {eps}")
+    return max(8, math.ceil(math.log2(max(n_hint, 2)) / (2 * eps)))
+
+
+def sketch_quantiles(values, qs, eps=DEFAULT_EPS):
+    """Approximate quantiles of one array through a streaming sketch"""
+    values = np.asarray(values, dtype=float)
+    sketch = QuantileSketch.for_error(eps, n_hint=max(len(values), 2)).update(values)
+    return np.array([sketch.quantile(q) for q in qs])
@@ -0,0 +1,180 @@
+"""
+Streaming Utilities for UIDAI Pulse
+Chunk-wise generator stages and one-pass mergeable accumulators
+"""
+
+import pandas as pd
+import numpy as np
+from pathlib import Path
+
+from .cleaning import (
+    GHOST_THRESHOLD, normalize_names, remove_ghost_districts, clip_metrics,
+    fill_missing, add_risk_scores
+)
+from .sketches import DEFAULT_EPS, QuantileSketch, k_for_error
+
+
+# ============================================================================
+# ROW-LOCAL CHUNK STAGES
+# ============================================================================
+def iter_csv_chunks(path, chunksize=100_000):
+    """Yield DataFrame chunks from a CSV file"""
+    with pd.read_csv(path, chunksize=chunksize) as reader:
+        for chunk in reader:
+            yield chunk
+
+
+def iter_parquet_chunks(path, chunksize=100_000):
+    """Yield DataFrame chunks from a Parquet file, indexed by row position like CSV chunks"""
+    import pyarrow.parquet as pq
+    start = 0
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+        chunk = batch.to_pandas()
+        chunk.index = pd.RangeIndex(start, start + len(chunk))
+        start += len(chunk)
+        yield chunk
+
+
+def iter_chunks(path, chunksize=100_000):
+    """Yield DataFrame chunks from a CSV or Parquet input"""
+    if Path(path).suffix == '.parquet':
+        return iter_parquet_chunks(path, chunksize)
+    return iter_csv_chunks(path, chunksize)
+
+
+def normalize_chunks(chunks):
+    """Normalize state and district names chunk by chunk"""
+    for chunk in chunks:
+        yield normalize_names(chunk)
+
+
+def remove_ghost_chunks(chunks, threshold=GHOST_THRESHOLD):
+    """Drop rows with enrolment at or below the threshold"""
+    for chunk in chunks:
+        chunk, _ = remove_ghost_districts(chunk, threshold)
+        yield chunk
+
+
+def winsorize_chunks(chunks, columns=None):
+    """Clip percentage metrics to the 0-100 range"""
+    for chunk in chunks:
+        yield clip_metrics(chunk, columns)
+
+
+def fill_chunks(chunks, fill_values):
+    """Fill missing numeric values from precomputed per-column values"""
+    for chunk in chunks:
+        yield fill_missing(chunk, fill_values)
+
+
+def risk_score_chunks(chunks):
+    """Add Risk_Score and Risk_Category to each chunk"""
+    for chunk in chunks:
+        yield add_risk_scores(chunk)
+
+
+# ============================================================================
+# MERGEABLE ACCUMULATORS
+# ============================================================================
+class QuantileAccumulator:
+    """Per-column quantile sketches fed chunk by chunk, sized for rank error `eps` (or a fixed `k`)"""
+
+    def __init__(self, columns=None, k=None, eps=DEFAULT_EPS):
+        self.columns = columns
+        self.k = k if k is not None else k_for_error(eps)
+        self.sketches = {}
+
+    def update(self, chunk):
+        columns = self.columns
+        if columns is None:
+            columns = chunk.select_dtypes(include=[np.number]).columns
+        for col in columns:
+            if col in chunk.columns:
+                self.sketches.setdefault(col, QuantileSketch(self.k)).update(chunk[col].to_numpy())
+        return self
+
+    def merge(self, other):
+        for col, sketch in other.sketches.items():
+            if col in self.sketches:
+                self.sketches[col].merge(sketch)
+            else:
+                self.sketches[col] = sketch
+        return self
+
+    def quantile(self, q):
+        """Return a {column: value} mapping for the q-th quantile"""
+        return {col: sketch.quantile(q) for col, sketch in self.sketches.items()}
+
+    def to_dict(self):
+        return {col: sketch.to_dict() for col, sketch in self.sketches.items()}
+
+    @classmethod
+    def from_dict(cls, data, columns=None, k=None, eps=DEFAULT_EPS):
+        acc = cls(columns, k, eps)
+        acc.sketches = {col: QuantileSketch.from_dict(sketch) for col, sketch in data.items()}
+        return acc
+
+
+class GroupStatsAccumulator:
+    """Running per-group sums and counts that merge into sums/means"""
+
+    def __init__(self, key, aggregations):
+        self.key = key
+        self.aggregations = aggregations
+        self.sums = None
+        self.counts = None
+
+    def update(self, chunk):
+        columns = [col for col in self.aggregations if col in chunk.columns]
+        if self.key not in chunk.columns or not columns:
+            return self
+
+        grouped = chunk.groupby(self.key, observed=True)[columns]
+        self._combine(grouped.sum(), grouped.count())
+        return self
+
+    def merge(self, other):
+        if other.sums is not None:
+            self._combine(other.sums, other.counts)
+        return self
+
+    def _combine(self, sums, counts):
+        if self.sums is None:
+            self.sums, self.counts = sums, counts
+        else:
+            self.sums = self.sums.add(sums, fill_value=0)
+            self.counts = self.counts.add(counts, fill_value=0)
+
+    def to_dict(self):
+        """JSON-serialisable partial sums and counts"""
+        if self.sums is None:
+            return {'sums': {}, 'counts': {}}
+        return {
+            'sums': self.sums.astype(float).to_dict(orient='index'),
+            'counts': self.counts.astype(float).to_dict(orient='index'),
+        }
+
+    @classmethod
+    def from_dict(cls, data, key, aggregations):
+        acc = cls(key, aggregations)
+        if data['sums']:
+            acc.sums = pd.DataFrame.from_dict(data['sums'], orient='index').rename_axis(key)
+            acc.counts = pd.DataFrame.from_dict(data['counts'], orient='index').rename_axis(key)
+        return acc
+
+    def result(self):
+        """Finalize into a DataFrame with one row per group"""
+        if self.sums is None:
+            return pd.DataFrame(columns=[self.key] + list(self.aggregations))
+
+        result = pd.DataFrame(index=self.sums.index)
+        for col, how in self.aggregations.items():
+            if col not in self.sums.columns:
+                continue
+            if how == 'sum':
+                result[col] = self.sums[col]
+            elif how == 'mean':
+                result[col] = self.sums[col] / self.counts[col].replace(0, np.nan)
+            elif how == 'count':
+                result[col] = self.counts[col]
+        return result.reset_index()
@@ -0,0 +1,72 @@
+"""
+Synthetic Master Data for UIDAI Pulse
+Generates raw enrolment data in the `final_master_data.csv` schema at any size
+"""
+
+import pandas as pd
+import numpy as np
+from pathlib import Path
+
+
+STATES = [
+    'ANDHRA PRADESH', 'ASSAM', 'BIHAR', 'CHANDIGARH', 'CHHATTISGARH', 'DELHI',
+    'GOA', 'GUJARAT', 'HARYANA', 'HIMACHAL PRADESH', 'JHARKHAND', 'KARNATAKA',
+    'KERALA', 'MADHYA PRADESH', 'MAHARASHTRA', 'ODISHA', 'PUDUCHERRY', 'PUNJAB',
+    'RAJASTHAN', 'TAMIL NADU', 'TELANGANA', 'UTTAR PRADESH', 'UTTARAKHAND',
+    'WEST BENGAL'
+]
+
+# Districts per state; row counts beyond this repeat districts (e.g. monthly snapshots)
+DISTRICTS_PER_STATE = 40
+
+
+def generate_master_data(rows, seed=0, missing_rate=0.01, ghost_rate=0.01):
+    """Raw master data with `rows` rows, shaped like the provided dataset
+
+    Includes the dirt the cleaning engine handles: untrimmed lower-case
+    names, ghost districts (enrolment ≤ 100), metrics outside 0-100 and
+    missing values at `missing_rate`.
+    """
+    rng = np.random.default_rng(seed)
+    state_codes = rng.integers(0, len(STATES), rows)
+    district_codes = rng.integers(0, DISTRICTS_PER_STATE, rows)
+
+    names = np.array(STATES)
+    # A few names arrive untrimmed or lower-case, as in raw extracts
+    dirty_names = np.array([f' {state.lower()} ' for state in STATES])
+    states = np.where(rng.random(rows) < 0.05, dirty_names[state_codes], names[state_codes])
+
+    district_names = np.array([f'district {i}' for i in range(DISTRICTS_PER_STATE)])
+    districts = np.char.add(np.char.add(names[state_codes], ' '), district_names[district_codes])
+
+    enrolment = rng.lognormal(mean=12.5, sigma=0.9, size=rows).astype(np.int64)
+    enrolment[rng.random(rows) < ghost_rate] = rng.integers(0, 101)
+
+    migration = rng.normal(58, 14, rows)
+    df = pd.DataFrame({
+        'State': states,
+        'District': districts,
+        'Total_Enrolment': enrolment,
+        'Migration_Intensity': migration,
+        'Biometric_Lag': 0.4 * migration + rng.normal(30, 12, rows),
+        'Digital_Penetration': rng.normal(76, 10, rows),
+        'Mobile_Linkage_Rate': rng.normal(82, 8, rows),
+        'Update_Frequency': rng.gamma(4, 8, rows),
+    })
+
+    for col in ['Migration_Intensity', 'Biometric_Lag', 'Digital_Penetration',
+                'Mobile_Linkage_Rate', 'Update_Frequency']:
+        df[col] = df[col].round(1)
+        df.loc[rng.random(rows) < missing_rate, col] = np.nan
+    return df
+
+
+def write_master_data_csv(path, rows, seed=0, chunk_rows=1_000_000):
+    """Write `rows` synthetic rows to a CSV in chunks so memory stays bounded"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', newline='') as f:
+        for i, start in enumerate(range(0, rows, chunk_rows)):
+            chunk = generate_master_data(min(chunk_rows, rows - start), seed=seed + i)
+            chunk.to_csv(f, index=False, header=(i == 0))
+    return path
@@ -0,0 +1,339 @@
+"""
+User Store for UIDAI Pulse
+Pluggable account storage: indexed SQLite (WAL) with a one-time import of the legacy JSON file
+"""
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+
+from .cache import atomic_path, file_fingerprint, file_lock
+
+
+USER_FIELDS = ['password', 'email', 'role', 'created_at']
+USER_ROLES = ['user', 'admin', 'analyst']
+
+# Backend used when none is named; UIDAI_USER_STORE=json keeps the legacy file
+DEFAULT_BACKEND = 'sqlite'
+USER_STORE_BACKENDS = ['sqlite', 'json']
+
+LEGACY_JSON_PATH = Path("user_database.json")
+SQLITE_PATH = Path("user_database.db")
+
+# Connections shared by all sessions of one server process
+POOL_SIZE = 4
+BUSY_TIMEOUT_MS = 5000
+
+
+class UserStore(ABC):
+    """Account storage interface: records are dicts of USER_FIELDS keyed by username"""
+
+    @abstractmethod
+    def get(self, username):
+        """Record for `username`, or None"""
+
+    @abstractmethod
+    def add(self, username, record):
+        """Insert a new user; False if the username is taken"""
+
+    @abstractmethod
+    def update(self, username, **fields):
+        """Change fields of an existing user; False if there is no such user"""
+
+    @abstractmethod
+    def add_many(self, users):
+        """Insert {username: record} all-or-nothing; raises ValueError if any username is taken"""
+
+    @abstractmethod
+    def all(self):
+        """Every user as {username: record}"""
+
+    def usernames(self):
+        """Set of every username"""
+        return set(self.all())
+
+    def __contains__(self, username):
+        return self.get(username) is not None
+
+    def __len__(self):
+        return len(self.all())
+
+
+class JsonUserStore(UserStore):
+    """Legacy whole-file store (`user_database.json`) with an in-process read-through cache
+
+    The parsed file is kept in memory and re-read only when the file's
+    (size, mtime, inode) or the version file changes; every write through
+    a store bumps the version, so edits from other processes (e.g.
+    `create_admin.py`) are picked up on the next call. Writes hold a lock
+    file, replace the file atomically and update the cache in place.
+    """
+
+    def __init__(self, path=LEGACY_JSON_PATH):
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(f".{self.path.name}.lock")
+        self.version_path = self.path.with_name(f".{self.path.name}.version")
+        self._users = None
+        self._stamp = None
+        self._cache_lock = threading.Lock()
+
+    def load(self):
+        """All users from the file ({} if it does not exist yet)"""
+        if self.path.exists():
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        return {}
+
+    def version(self):
+        """Write counter shared by every process using this file"""
+        try:
+            return int(self.version_path.read_text())
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def stamp(self):
+        """Identity of the file and its version; changes on every write"""
+        stamps = []
+        for path in (self.path, self.version_path):
+            try:
+                stamps.append(file_fingerprint(path))
+            except FileNotFoundError:
+                stamps.append(None)
+        return tuple(stamps)
+
+    def users(self):
+        """Cached {username: record}, re-parsed only after a write (treat as read-only)"""
+        stamp = self.stamp()
+        with self._cache_lock:
+            if self._users is None or stamp != self._stamp:
+                # Stamp taken before reading: a write in between only causes one extra re-read
+                self._users, self._stamp = self.load(), stamp
+            return self._users
+
+    def save(self, users):
+        """Replace the file with `users` and bump the version"""
+        with atomic_path(self.path) as tmp:
+            with open(tmp, 'w') as f:
+                json.dump(users, f, indent=4)
+        with atomic_path(self.version_path) as tmp:
+            tmp.write_text(str(self.version() + 1))
+
+        # Write-through: this process never re-reads its own write
+        with self._cache_lock:
+            self._users, self._stamp = users, self.stamp()
+
+    def get(self, username):
+        record = self.users().get(username)
+        return None if record is None else dict(record)
+
+    def all(self):
+        return {username: dict(record) for username, record in self.users().items()}
+
+    def __len__(self):
+        return len(self.users())
+
+    def add(self, username, record):
+        with file_lock(self.lock_path):
+            users = dict(self.users())
+            if username in users:
+                return False
+            users[username] = {field: record.get(field) for field in USER_FIELDS}
+            self.save(users)
+        return True
+
+    def add_many(self, users):
+        # One rewrite for the whole batch: the atomic replace is the commit
+        with file_lock(self.lock_path):
+            current = dict(self.users())
+            taken = sorted(set(users) & set(current))
+            if taken:
+                raise ValueError(f"{len(taken)} usernames already exist: {taken[:10]}")
+            for username, record in users.items():
+                current[username] = {field: record.get(field) for field in USER_FIELDS}
+            self.save(current)
+        return len(users)
+
+    def usernames(self):
+        return set(self.users())
+
+    def update(self, username, **fields):
+        with file_lock(self.lock_path):
+            users = dict(self.users())
+            if username not in users:
+                return False
+            users[username] = {**users[username], **fields}
+            self.save(users)
+        return True
+
+
+class SqliteUserStore(UserStore):
+    """Embedded SQLite store with a unique username index
+
+    WAL mode lets logins read while a registration writes, and each
+    registration is a single-row INSERT, so writers never rewrite other
+    users and a duplicate username fails on the index instead of being
+    overwritten. Connections come from a small pool shared across threads.
+    """
+
+    def __init__(self, path=SQLITE_PATH, legacy_json=LEGACY_JSON_PATH, pool_size=POOL_SIZE):
+        self.path = Path(path)
+        self.pool_size = pool_size
+        self._pool = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS users (
+                        username TEXT NOT NULL,
+                        password TEXT NOT NULL,
+                        email TEXT,
+                        role TEXT NOT NULL,
+                        created_at TEXT
+                    )
+                """)
+                conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS users_username ON users (username)")
+                conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+        if legacy_json is not None:
+            self.migrate_json(legacy_json)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=False)
+        conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        """Borrow a pooled connection (opened lazily, at most `pool_size`)"""
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                create = self._opened < self.pool_size
+                if create:
+                    self._opened += 1
+            conn = self._connect() if create else self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def close(self):
+        """Close idle pooled connections"""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._opened -= 1
+
+    def migrate_json(self, json_path):
+        """One-time import of a legacy JSON user file; returns the number of users added
+
+        Runs once per database (recorded in `meta`); users that already
+        exist in SQLite are kept as they are.
+        """
+        json_path = Path(json_path)
+        if not json_path.exists():
+            return 0
+
+        with self._connection() as conn:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                if conn.execute("SELECT 1 FROM meta WHERE key = 'json_migrated'").fetchone():
+                    return 0
+                users = JsonUserStore(json_path).load()
+                before = conn.total_changes
+                conn.executemany(
+                    "INSERT OR IGNORE INTO users (username, password, email, role, created_at) VALUES (?, ?, ?, ?, ?)",
+                    [(username,) + tuple(record.get(field) for field in USER_FIELDS)
+                     for username, record in users.items()]
+                )
+                added = conn.total_changes - before
+                conn.execute("INSERT INTO meta (key, value) VALUES ('json_migrated', ?)", (str(json_path),))
+
+        print(f"✓ Imported {added} users from {json_path} into {self.path}")
+        return added
+
+    def get(self, username):
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT password, email, role, created_at FROM users WHERE username = ?", (username,)
+            ).fetchone()
+        return None if row is None else dict(zip(USER_FIELDS, row))
+
+    def add(self, username, record):
+        try:
+            with self._connection() as conn:
+                with conn:
+                    conn.execute(
+                        "INSERT INTO users (username, password, email, role, created_at) VALUES (?, ?, ?, ?, ?)",
+                        (username,) + tuple(record.get(field) for field in USER_FIELDS)
+                    )
+        except sqlite3.IntegrityError:
+            return False
+        return True
+
+    def add_many(self, users):
+        rows = [(username,) + tuple(record.get(field) for field in USER_FIELDS) for username, record in users.items()]
+        with self._connection() as conn:
+            try:
+                with conn:
+                    # One transaction: any duplicate on the unique index rolls back the whole batch
+                    conn.execute("BEGIN IMMEDIATE")
+                    conn.executemany(
+                        "INSERT INTO users (username, password, email, role, created_at) VALUES (?, ?, ?, ?, ?)",
+                        rows
+                    )
+            except sqlite3.IntegrityError:
+                taken = sorted(set(users) & self.usernames())
+                raise ValueError(f"{len(taken)} usernames already exist: {taken[:10]}") from None
+        return len(rows)
+
+    def usernames(self):
+        with self._connection() as conn:
+            return {row[0] for row in conn.execute("SELECT username FROM users")}
+
+    def update(self, username, **fields):
+        unknown = set(fields) - set(USER_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown user fields: {sorted(unknown)}")
+        if not fields:
+            return username in self
+        assignments = ", ".join(f"{field} = ?" for field in fields)
+        with self._connection() as conn:
+            with conn:
+                cursor = conn.execute(
+                    f"UPDATE users SET {assignments} WHERE username = ?", tuple(fields.values()) + (username,)
+                )
+        return cursor.rowcount > 0
+
+    def all(self):
+        with self._connection() as conn:
+            rows = conn.execute("SELECT username, password, email, role, created_at FROM users").fetchall()
+        return {row[0]: dict(zip(USER_FIELDS, row[1:])) for row in rows}
+
+    def __len__(self):
+        with self._connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+
+def open_user_store(backend=None, path=None):
+    """User store for `backend` ('sqlite' or 'json'; default from UIDAI_USER_STORE)"""
+    backend = (backend or os.environ.get('UIDAI_USER_STORE') or DEFAULT_BACKEND).lower()
+    if backend == 'sqlite':
+        return SqliteUserStore(path or SQLITE_PATH)
+    if backend == 'json':
+        return JsonUserStore(path or LEGACY_JSON_PATH)
+    raise ValueError(f"Unknown user store backend: {backend} (expected one of {USER_STORE_BACKENDS})")